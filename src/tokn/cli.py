@@ -1,29 +1,132 @@
 """CLI interface for tokn."""
 
+import json
 import sys
-from datetime import datetime, timedelta
+from datetime import UTC, datetime, timedelta
+from functools import cache
 
 import click
-from rich.console import Console
-from rich.table import Table
-from tabulate import tabulate
 
 from tokn import __version__
 from tokn.core.backend import get_backend, get_config, save_config
 from tokn.core.backend.factory import migrate_backend
-from tokn.core.rotation import RotationOrchestrator
 from tokn.core.token import RotationType, TokenLocation, TokenMetadata, TokenStatus
 from tokn.utils.progress import progress_spinner
 
-console = Console(stderr=True)
-stdout_console = Console()
+_SERVICES = (
+    "github",
+    "cloudflare-account-token",
+    "linode",
+    "terraform",
+    "akamai",
+    "postman",
+    "other",
+)
+
+# (emoji, color) used to render each token status
+_STATUS_STYLE = {
+    TokenStatus.ACTIVE: ("✓", "green"),
+    TokenStatus.EXPIRING_SOON: ("⚠", "yellow"),
+    TokenStatus.EXPIRED: ("✗", "red"),
+}
+
+# Rich table status cell per status, rendered once from the template
+_STATUS_CELL_TMPL = "[{color}]{emoji} {value}[/{color}]"
+_STATUS_CELL = {
+    status: _STATUS_CELL_TMPL.format(color=color, emoji=emoji, value=status.value)
+    for status, (emoji, color) in _STATUS_STYLE.items()
+}
+
+# Plain-text status cell per status, for tabulate output
+_STATUS_TEXT = {
+    status: f"{emoji} {status.value}" for status, (emoji, _) in _STATUS_STYLE.items()
+}
+
+
+# Shared by every command that renders tokens
+_format_option = click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["rich", "simple", "plain", "json"]),
+    default="rich",
+    help="Output format (rich=styled, simple=tabulate, plain=no borders, json)",
+)
+
+
+@cache
+def console():
+    """Return the stderr console, importing rich on first use."""
+    from rich.console import Console
+
+    return Console(stderr=True, highlight=False, emoji=False)
+
+
+@cache
+def stdout_console():
+    """Return the stdout console, importing rich on first use."""
+    from rich.console import Console
+
+    return Console(highlight=False, emoji=False)
+
+
+def _state() -> dict:
+    """Return the per-invocation state dict that the cli group stores in ctx.obj."""
+    return click.get_current_context().ensure_object(dict)
+
+
+def _get_config():
+    """Return the tokn config, read once per CLI invocation."""
+    state = _state()
+    if "config" not in state:
+        state["config"] = get_config()
+    return state["config"]
+
+
+def _get_backend():
+    """Return the configured backend, created once per CLI invocation."""
+    state = _state()
+    if "backend" not in state:
+        state["backend"] = get_backend(config=_get_config())
+    return state["backend"]
+
+
+def _get_registry(for_update: bool = False):
+    """Return the token registry, loaded once per CLI invocation.
+
+    Commands that modify and save the registry pass ``for_update`` so they
+    build on the backend's latest copy instead of a cached one.
+    """
+    state = _state()
+    if for_update:
+        state["registry"] = _get_backend().load_for_update()
+    elif "registry" not in state:
+        state["registry"] = _get_backend().load_registry()
+    return state["registry"]
+
+
+def _parse_location(loc: str) -> TokenLocation | None:
+    """Parse 'type:path[:key=value,...]' into a TokenLocation (None if invalid)."""
+    if ":" not in loc:
+        return None
+
+    loc_type, _, rest = loc.partition(":")
+    loc_path, _, meta_str = rest.partition(":")
+    metadata = {}
+    for pair in meta_str.split(","):
+        key, sep, value = pair.partition("=")
+        if sep:
+            metadata[key.strip()] = value.strip()
+
+    return TokenLocation(type=loc_type, path=loc_path, metadata=metadata)
 
 
 @click.group()
 @click.version_option(version=__version__)
-def cli():
+@click.pass_context
+def cli(ctx: click.Context):
     """tokn - Simple API token management."""
-    pass
+    # Shared by all subcommands; config/backend/registry are filled lazily
+    ctx.ensure_object(dict)
 
 
 @cli.command()
@@ -31,17 +134,7 @@ def cli():
 @click.option(
     "--service",
     required=True,
-    type=click.Choice(
-        [
-            "github",
-            "cloudflare-account-token",
-            "linode",
-            "terraform",
-            "akamai",
-            "postman",
-            "other",
-        ]
-    ),
+    type=click.Choice(_SERVICES, case_sensitive=False),
     help="Service provider",
 )
 @click.option(
@@ -63,15 +156,9 @@ def track(
     notes: str,
 ):
     """Track a new token."""
-    backend = get_backend()
-    registry = backend.load_registry()
-
-    if registry.get_token(name):
-        console.print(f"[red]Token '{name}' already exists[/red]", style="red")
-        sys.exit(1)
-
+    # Validate arguments before touching the backend so bad input fails fast
     if service == "other" and rotation_type == "auto":
-        console.print(
+        console().print(
             "[yellow]Note: Service 'other' only supports manual rotation. "
             "Setting rotation type to 'manual'.[/yellow]"
         )
@@ -79,25 +166,23 @@ def track(
 
     locations = []
     for loc in location:
-        if ":" not in loc:
-            console.print(f"[red]Invalid location format: {loc}. Use 'type:path'[/red]")
+        parsed = _parse_location(loc)
+        if parsed is None:
+            console().print(
+                f"[red]Invalid location format: {loc}. Use 'type:path'[/red]"
+            )
             sys.exit(1)
+        locations.append(parsed)
 
-        parts = loc.split(":", 2)
-        loc_type = parts[0]
-        loc_path = parts[1]
-        metadata = {}
-
-        if len(parts) == 3:
-            for pair in parts[2].split(","):
-                if "=" in pair:
-                    key, value = pair.split("=", 1)
-                    metadata[key.strip()] = value.strip()
+    if not locations and service != "other":
+        console().print("[red]At least one location is required[/red]")
+        sys.exit(1)
 
-        locations.append(TokenLocation(type=loc_type, path=loc_path, metadata=metadata))
+    backend = _get_backend()
+    registry = _get_registry(for_update=True)
 
-    if not locations and service != "other":
-        console.print("[red]At least one location is required[/red]")
+    if registry.get_token(name):
+        console().print(f"[red]Token '{name}' already exists[/red]", style="red")
         sys.exit(1)
 
     token_metadata = TokenMetadata(
@@ -105,7 +190,7 @@ def track(
         service=service,
         rotation_type=RotationType(rotation_type),
         locations=locations,
-        expires_at=datetime.now() + timedelta(days=expiry_days),
+        expires_at=datetime.now(UTC) + timedelta(days=expiry_days),
         notes=notes,
     )
 
@@ -114,22 +199,22 @@ def track(
         backend.save_registry(registry)
     except ValueError as e:
         if "exceeds Doppler's 50KB limit" in str(e):
-            console.print(f"[red]✗ {str(e)}[/red]")
-            console.print("\n[yellow]Suggestions:[/yellow]")
-            console.print(
+            console().print(f"[red]✗ {str(e)}[/red]")
+            console().print("\n[yellow]Suggestions:[/yellow]")
+            console().print(
                 "  1. Remove old/unused tokens: [cyan]tokn remove <name>[/cyan]"
             )
-            console.print(
+            console().print(
                 "  2. Migrate to local backend: "
                 "[cyan]tokn backend migrate --from doppler --to local[/cyan]"
             )
             sys.exit(1)
         raise
 
-    stdout_console.print("[green]✓ Token tracked successfully[/green]")
-    stdout_console.print(f"  [cyan]Name:[/cyan] {name}")
-    stdout_console.print(f"  [cyan]Service:[/cyan] {service}")
-    stdout_console.print(f"  [cyan]Type:[/cyan] {rotation_type}")
+    stdout_console().print("[green]✓ Token tracked successfully[/green]")
+    stdout_console().print(f"  [cyan]Name:[/cyan] {name}")
+    stdout_console().print(f"  [cyan]Service:[/cyan] {service}")
+    stdout_console().print(f"  [cyan]Type:[/cyan] {rotation_type}")
 
 
 @cli.command()
@@ -137,47 +222,54 @@ def track(
     "--all", "rotate_all", is_flag=True, help="Rotate all auto-rotatable tokens"
 )
 @click.option("--auto-only", is_flag=True, default=True, help="Skip manual tokens")
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=4,
+    help="Services rotated in parallel with --all",
+)
 @click.argument("token_name", required=False)
-def rotate(rotate_all: bool, auto_only: bool, token_name: str):
+def rotate(rotate_all: bool, auto_only: bool, concurrency: int, token_name: str):
     """Rotate tokens."""
-    orchestrator = RotationOrchestrator()
-    backend = get_backend()
+    from tokn.core.rotation import RotationOrchestrator
+
+    orchestrator = RotationOrchestrator(backend=_get_backend())
 
     if rotate_all:
         with progress_spinner("Rotating tokens"):
-            results = orchestrator.rotate_all(auto_only=auto_only)
+            results = orchestrator.rotate_all(
+                auto_only=auto_only, max_workers=concurrency
+            )
 
         if results["success"]:
-            stdout_console.print("[bold green]✓ Successfully rotated:[/bold green]")
+            lines = ["[bold green]✓ Successfully rotated:[/bold green]"]
             for item in results["success"]:
-                stdout_console.print(f"  [green]•[/green] [cyan]{item['name']}[/cyan]")
-                for loc in item["locations"]:
-                    stdout_console.print(f"    [dim]→[/dim] {loc}")
+                lines.append(f"  [green]•[/green] [cyan]{item['name']}[/cyan]")
+                lines.extend(f"    [dim]→[/dim] {loc}" for loc in item["locations"])
+            stdout_console().print("\n".join(lines))
 
         if results["failed"]:
-            console.print("\n[bold red]✗ Failed to rotate:[/bold red]")
-            for item in results["failed"]:
-                console.print(
-                    f"  [red]•[/red] [cyan]{item['name']}[/cyan]: "
-                    f"[red]{item['error']}[/red]"
-                )
+            lines = ["\n[bold red]✗ Failed to rotate:[/bold red]"]
+            lines.extend(
+                f"  [red]•[/red] [cyan]{item['name']}[/cyan]: "
+                f"[red]{item['error']}[/red]"
+                for item in results["failed"]
+            )
+            console().print("\n".join(lines))
 
         if results["manual"]:
-            stdout_console.print(
-                "\n[bold yellow]⚠ Manual rotation required:[/bold yellow]"
-            )
+            lines = ["\n[bold yellow]⚠ Manual rotation required:[/bold yellow]"]
             for item in results["manual"]:
-                stdout_console.print(
-                    f"  [yellow]•[/yellow] [cyan]{item['name']}[/cyan]"
-                )
-                stdout_console.print(f"[dim]{item['instructions']}[/dim]")
+                lines.append(f"  [yellow]•[/yellow] [cyan]{item['name']}[/cyan]")
+                lines.append(f"[dim]{item['instructions']}[/dim]")
+            stdout_console().print("\n".join(lines))
 
     elif token_name:
-        registry = backend.load_registry()
+        registry = _get_registry(for_update=True)
         token = registry.get_token(token_name)
 
         if not token:
-            console.print(f"[red]✗ Token not found:[/red] [cyan]{token_name}[/cyan]")
+            console().print(f"[red]✗ Token not found:[/red] [cyan]{token_name}[/cyan]")
             sys.exit(1)
 
         # Type guard: token is guaranteed to be TokenMetadata here
@@ -187,172 +279,187 @@ def rotate(rotate_all: bool, auto_only: bool, token_name: str):
             success, message, locations = orchestrator.rotate_token(token)
 
         if success:
-            stdout_console.print(f"[green]✓ {message}[/green]")
-            for loc in locations:
-                stdout_console.print(f"  [dim]→[/dim] {loc}")
+            lines = [f"[green]✓ {message}[/green]"]
+            lines.extend(f"  [dim]→[/dim] {loc}" for loc in locations)
+            stdout_console().print("\n".join(lines))
         else:
-            console.print(f"[red]✗ {message}[/red]")
+            console().print(f"[red]✗ {message}[/red]")
             sys.exit(1)
 
     else:
-        console.print("[red]Specify --all or provide a token name[/red]")
+        console().print("[red]Specify --all or provide a token name[/red]")
         sys.exit(1)
 
 
 @cli.command("list")
 @click.option("--expiring", is_flag=True, help="Show only expiring tokens")
-@click.option(
-    "--format",
-    "output_format",
-    type=click.Choice(["rich", "simple", "plain"]),
-    default="rich",
-    help="Output format (rich=styled, simple=tabulate, plain=no borders)",
-)
+@_format_option
 def list_tokens(expiring: bool, output_format: str):
     """List all tracked tokens."""
-    backend = get_backend()
-    registry = backend.load_registry()
+    registry = _get_registry()
 
     tokens = registry.list_tokens()
-    if not tokens:
-        console.print(
+    as_json = output_format == "json"
+    if not tokens and not as_json:
+        console().print(
             "[yellow]No tokens tracked yet. Use[/yellow] "
             "[cyan]tokn track[/cyan] [yellow]to get started.[/yellow]"
         )
         return
 
+    # One clock read for the whole listing
+    now = datetime.now(UTC)
+
     # Filter if --expiring
     if expiring:
-        tokens = [t for t in tokens if t.status != TokenStatus.ACTIVE]
+        tokens = [t for t in tokens if t.status_at(now) != TokenStatus.ACTIVE]
+        if not tokens and not as_json:
+            console().print("[green]No expiring or expired tokens.[/green]")
+            return
+
+    # JSON output skips row formatting and Rich rendering entirely
+    if as_json:
+        click.echo(json.dumps([_token_to_json(token, now) for token in tokens]))
+        return
+
+    # Output based on format
+    if output_format == "rich":
+        _print_rich_table(tokens, registry, now)
+    else:
+        tablefmt = "simple" if output_format == "simple" else "plain"
+        _print_tabulate_table(tokens, tablefmt, now)
+        if registry.last_sync:
+            sync_time = registry.last_sync.strftime("%Y-%m-%d %H:%M:%S")
+            print(f"\nLast sync: {sync_time}")
+
+
+def _token_to_json(token, now: datetime | None = None) -> dict:
+    """Serialize a token with its computed expiry fields for JSON output."""
+    data = token.model_dump(mode="json")
+    days = token.days_until_expiry_at(now or datetime.now(UTC))
+    data["status"] = TokenMetadata.status_from_days(days).value
+    data["days_until_expiry"] = days
+    return data
+
 
-    # Prepare data rows
-    rows = []
+def _token_rows(tokens: list, now: datetime):
+    """Yield (name, service, type, status, expires, last_rotated) per token."""
     for token in tokens:
-        status_emoji = {
-            TokenStatus.ACTIVE: "✓",
-            TokenStatus.EXPIRING_SOON: "⚠",
-            TokenStatus.EXPIRED: "✗",
-        }
+        # Status derives from the same days value as the Expires column
+        days = token.days_until_expiry_at(now)
+        status = TokenMetadata.status_from_days(days)
 
         expiry_str = "N/A"
-        if token.expires_at:
-            days = token.days_until_expiry
-            if days is not None:
-                expiry_str = f"{days} days"
+        if days is not None:
+            expiry_str = f"{days} days"
 
         last_rotated_str = "Never"
         if token.last_rotated:
             last_rotated_str = token.last_rotated.strftime("%Y-%m-%d")
 
-        rows.append(
-            {
-                "name": token.name,
-                "service": token.service,
-                "type": token.rotation_type.value,
-                "status": token.status.value,
-                "status_emoji": status_emoji[token.status],
-                "expires": expiry_str,
-                "last_rotated": last_rotated_str,
-            }
+        yield (
+            token.name,
+            token.service,
+            token.rotation_type.value,
+            status,
+            expiry_str,
+            last_rotated_str,
         )
 
-    # Output based on format
-    if output_format == "rich":
-        _print_rich_table(rows, registry)
-    else:
-        tablefmt = "simple" if output_format == "simple" else "plain"
-        _print_tabulate_table(rows, tablefmt)
-        if registry.last_sync:
-            sync_time = registry.last_sync.strftime("%Y-%m-%d %H:%M:%S")
-            print(f"\nLast sync: {sync_time}")
 
-
-def _print_rich_table(rows: list, registry) -> None:
+def _print_rich_table(tokens: list, registry, now: datetime) -> None:
     """Print tokens as rich styled table."""
-    status_color = {
-        "active": "green",
-        "expiring_soon": "yellow",
-        "expired": "red",
-    }
+    from rich.table import Table
 
     table = Table(
         title="[bold]Token Status[/bold]", show_header=True, header_style="bold"
     )
     table.add_column("Name", style="cyan", no_wrap=True)
     table.add_column("Service", style="magenta")
-    table.add_column("Type", style="blue")
-    table.add_column("Status")
+    # Fixed widths for columns with bounded values skip Rich's measuring pass
+    table.add_column("Type", style="blue", width=6, no_wrap=True)
+    table.add_column("Status", width=15, no_wrap=True)
     table.add_column("Expires", style="yellow")
-    table.add_column("Last Rotated", style="dim")
+    table.add_column("Last Rotated", style="dim", width=12, no_wrap=True)
 
-    for row in rows:
-        color = status_color[row["status"]]
-        table.add_row(
-            row["name"],
-            row["service"],
-            row["type"],
-            f"[{color}]{row['status_emoji']} {row['status']}[/{color}]",
-            row["expires"],
-            row["last_rotated"],
-        )
+    for name, service, rotation_type, status, expires, last in _token_rows(tokens, now):
+        table.add_row(name, service, rotation_type, _STATUS_CELL[status], expires, last)
 
-    stdout_console.print(table)
+    stdout_console().print(table)
 
     if registry.last_sync:
         sync_time = registry.last_sync.strftime("%Y-%m-%d %H:%M:%S")
-        stdout_console.print(f"\n[dim]Last sync: {sync_time}[/dim]")
+        stdout_console().print(f"\n[dim]Last sync: {sync_time}[/dim]")
 
 
-def _print_tabulate_table(rows: list, tablefmt: str) -> None:
-    """Print tokens as tabulate table."""
+def _print_tabulate_table(tokens: list, tablefmt: str, now: datetime) -> None:
+    """Print tokens as a simple/plain text table (tabulate-compatible layout)."""
     table_data = [
-        [
-            row["name"],
-            row["service"],
-            row["type"],
-            f"{row['status_emoji']} {row['status']}",
-            row["expires"],
-            row["last_rotated"],
-        ]
-        for row in rows
+        (name, service, rotation_type, _STATUS_TEXT[status], expires, last)
+        for name, service, rotation_type, status, expires, last in _token_rows(
+            tokens, now
+        )
     ]
     headers = ["Name", "Service", "Type", "Status", "Expires", "Last Rotated"]
-    print(tabulate(table_data, headers=headers, tablefmt=tablefmt))
+    print(_render_columns(table_data, headers, rule=tablefmt == "simple"))
+
+
+def _render_columns(rows: list, headers: list, rule: bool) -> str:
+    """Render left-aligned text columns the way tabulate's simple/plain do.
+
+    Columns are separated by two spaces and sized to the wider of the
+    longest cell and the header plus two. With rule=True a dashed line
+    separates the header from the rows.
+    """
+    widths = [len(header) + 2 for header in headers]
+    for row in rows:
+        widths = [max(width, len(cell)) for width, cell in zip(widths, row)]
+
+    def line(cells) -> str:
+        return "  ".join(cell.ljust(w) for cell, w in zip(cells, widths)).rstrip()
+
+    lines = [line(headers)]
+    if rule:
+        lines.append("  ".join("-" * w for w in widths))
+    lines.extend(line(row) for row in rows)
+    return "\n".join(lines)
 
 
 @cli.command()
 def sync():
     """Sync metadata from backend."""
-    backend = get_backend()
+    backend = _get_backend()
 
     with progress_spinner(f"Syncing from {backend.backend_type} backend"):
         registry = backend.sync()
 
-    stdout_console.print(f"[green]✓ Synced from {backend.backend_type} backend[/green]")
-    stdout_console.print(f"  [cyan]Tokens:[/cyan] {len(registry.tokens)}")
+    stdout_console().print(
+        f"[green]✓ Synced from {backend.backend_type} backend[/green]"
+    )
+    stdout_console().print(f"  [cyan]Tokens:[/cyan] {len(registry.tokens)}")
     if registry.last_sync:
         sync_time = registry.last_sync.strftime("%Y-%m-%d %H:%M:%S")
-        stdout_console.print(f"  [cyan]Last sync:[/cyan] [dim]{sync_time}[/dim]")
+        stdout_console().print(f"  [cyan]Last sync:[/cyan] [dim]{sync_time}[/dim]")
 
 
 @cli.command()
 @click.argument("name")
 def remove(name: str):
     """Remove a tracked token."""
-    backend = get_backend()
-    registry = backend.load_registry()
+    backend = _get_backend()
+    registry = _get_registry(for_update=True)
 
     if registry.remove_token(name):
         try:
             backend.save_registry(registry)
         except ValueError as e:
             if "exceeds Doppler's 50KB limit" in str(e):
-                console.print(f"[red]✗ {str(e)}[/red]")
+                console().print(f"[red]✗ {str(e)}[/red]")
                 sys.exit(1)
             raise
-        stdout_console.print(f"[green]✓ Token removed:[/green] [cyan]{name}[/cyan]")
+        stdout_console().print(f"[green]✓ Token removed:[/green] [cyan]{name}[/cyan]")
     else:
-        console.print(f"[red]✗ Token not found:[/red] [cyan]{name}[/cyan]")
+        console().print(f"[red]✗ Token not found:[/red] [cyan]{name}[/cyan]")
         sys.exit(1)
 
 
@@ -376,77 +483,60 @@ def update(
     notes: str | None,
 ):
     """Update a tracked token's metadata."""
-    backend = get_backend()
-    registry = backend.load_registry()
+    backend = _get_backend()
+    registry = _get_registry(for_update=True)
 
     token = registry.get_token(name)
     if not token:
-        console.print(f"[red]✗ Token not found:[/red] [cyan]{name}[/cyan]")
+        console().print(f"[red]✗ Token not found:[/red] [cyan]{name}[/cyan]")
         sys.exit(1)
 
     # Type guard: token is guaranteed to be TokenMetadata here
     assert token is not None
 
+    # Snapshot to skip the registry write when the options are no-ops
+    before = token.model_dump()
     changes_made = []
 
     # Update expiry
     if expiry_days is not None:
-        token.expires_at = datetime.now() + timedelta(days=expiry_days)
+        token.expires_at = datetime.now(UTC) + timedelta(days=expiry_days)
         changes_made.append(f"expiry set to {expiry_days} days")
 
     # Replace all locations
     if location:
         new_locations = []
         for loc in location:
-            if ":" not in loc:
-                console.print(f"[red]Invalid location format: {loc}[/red]")
+            parsed = _parse_location(loc)
+            if parsed is None:
+                console().print(f"[red]Invalid location format: {loc}[/red]")
                 sys.exit(1)
-            parts = loc.split(":", 2)
-            loc_type = parts[0]
-            loc_path = parts[1]
-            metadata = {}
-            if len(parts) == 3:
-                for pair in parts[2].split(","):
-                    if "=" in pair:
-                        key, value = pair.split("=", 1)
-                        metadata[key.strip()] = value.strip()
-            new_locations.append(
-                TokenLocation(type=loc_type, path=loc_path, metadata=metadata)
-            )
+            new_locations.append(parsed)
         token.locations = new_locations
         changes_made.append(f"locations replaced ({len(new_locations)} total)")
 
     # Add a location
     if add_location:
-        if ":" not in add_location:
-            console.print(f"[red]Invalid location format: {add_location}[/red]")
+        parsed = _parse_location(add_location)
+        if parsed is None:
+            console().print(f"[red]Invalid location format: {add_location}[/red]")
             sys.exit(1)
-        parts = add_location.split(":", 2)
-        loc_type = parts[0]
-        loc_path = parts[1]
-        metadata = {}
-        if len(parts) == 3:
-            for pair in parts[2].split(","):
-                if "=" in pair:
-                    key, value = pair.split("=", 1)
-                    metadata[key.strip()] = value.strip()
-        token.locations.append(
-            TokenLocation(type=loc_type, path=loc_path, metadata=metadata)
-        )
-        changes_made.append(f"added location {loc_type}:{loc_path}")
+        token.locations.append(parsed)
+        changes_made.append(f"added location {parsed.type}:{parsed.path}")
 
     # Remove a location
     if remove_location:
         original_count = len(token.locations)
+        remove_type, _, remove_path = remove_location.partition(":")
         token.locations = [
             loc
             for loc in token.locations
-            if f"{loc.type}:{loc.path}" != remove_location
+            if (loc.type, loc.path) != (remove_type, remove_path)
         ]
         if len(token.locations) < original_count:
             changes_made.append(f"removed location {remove_location}")
         else:
-            console.print(f"[yellow]Location not found: {remove_location}[/yellow]")
+            console().print(f"[yellow]Location not found: {remove_location}[/yellow]")
 
     # Update notes
     if notes is not None:
@@ -454,7 +544,15 @@ def update(
         changes_made.append("notes updated")
 
     if not changes_made:
-        console.print("[yellow]No changes specified. Use --help for options.[/yellow]")
+        console().print(
+            "[yellow]No changes specified. Use --help for options.[/yellow]"
+        )
+        return
+
+    if token.model_dump() == before:
+        stdout_console().print(
+            f"[green]✓ Token already up to date:[/green] [cyan]{name}[/cyan]"
+        )
         return
 
     registry.add_token(token)
@@ -462,44 +560,39 @@ def update(
         backend.save_registry(registry)
     except ValueError as e:
         if "exceeds Doppler's 50KB limit" in str(e):
-            console.print(f"[red]✗ {str(e)}[/red]")
-            console.print("\n[yellow]Suggestions:[/yellow]")
-            console.print(
+            console().print(f"[red]✗ {str(e)}[/red]")
+            console().print("\n[yellow]Suggestions:[/yellow]")
+            console().print(
                 "  1. Remove old/unused tokens: [cyan]tokn remove <name>[/cyan]"
             )
-            console.print(
+            console().print(
                 "  2. Migrate to local backend: "
                 "[cyan]tokn backend migrate --from doppler --to local[/cyan]"
             )
             sys.exit(1)
         raise
 
-    stdout_console.print(f"[green]✓ Token updated:[/green] [cyan]{name}[/cyan]")
-    for change in changes_made:
-        stdout_console.print(f"  [dim]→[/dim] {change}")
+    lines = [f"[green]✓ Token updated:[/green] [cyan]{name}[/cyan]"]
+    lines.extend(f"  [dim]→[/dim] {change}" for change in changes_made)
+    stdout_console().print("\n".join(lines))
 
 
 @cli.command("describe")
 @click.argument("name")
-@click.option(
-    "--format",
-    "output_format",
-    type=click.Choice(["rich", "simple", "plain"]),
-    default="rich",
-    help="Output format (rich=styled, simple=tabulate, plain=no borders)",
-)
+@_format_option
 def describe(name: str, output_format: str):
     """Show detailed information about a token."""
-    backend = get_backend()
-    registry = backend.load_registry()
+    registry = _get_registry()
 
     token = registry.get_token(name)
     if not token:
-        console.print(f"[red]✗ Token not found:[/red] [cyan]{name}[/cyan]")
+        console().print(f"[red]✗ Token not found:[/red] [cyan]{name}[/cyan]")
         sys.exit(1)
 
     if output_format == "rich":
         _print_rich_describe(token)
+    elif output_format == "json":
+        click.echo(json.dumps(_token_to_json(token)))
     else:
         tablefmt = "simple" if output_format == "simple" else "plain"
         _print_tabulate_describe(token, tablefmt)
@@ -507,50 +600,46 @@ def describe(name: str, output_format: str):
 
 def _print_rich_describe(token) -> None:
     """Print token details as rich styled output."""
-    status_color = {
-        TokenStatus.ACTIVE: "green",
-        TokenStatus.EXPIRING_SOON: "yellow",
-        TokenStatus.EXPIRED: "red",
-    }
-    status_style = status_color[token.status]
-
-    stdout_console.print(f"\n[bold cyan]{token.name}[/bold cyan]")
-    stdout_console.print(f"[cyan]Service:[/cyan] {token.service}")
-    stdout_console.print(f"[cyan]Rotation Type:[/cyan] {token.rotation_type.value}")
-    stdout_console.print(
-        f"[cyan]Status:[/cyan] [{status_style}]{token.status.value}[/{status_style}]"
-    )
+    days = token.days_until_expiry
+    status = TokenMetadata.status_from_days(days)
+    _, status_style = _STATUS_STYLE[status]
+
+    lines = [
+        f"\n[bold cyan]{token.name}[/bold cyan]",
+        f"[cyan]Service:[/cyan] {token.service}",
+        f"[cyan]Rotation Type:[/cyan] {token.rotation_type.value}",
+        f"[cyan]Status:[/cyan] [{status_style}]{status.value}[/{status_style}]",
+    ]
 
     if token.expires_at:
         expiry_date = token.expires_at.strftime("%Y-%m-%d")
-        stdout_console.print(
-            f"[cyan]Expires:[/cyan] {expiry_date} "
-            f"[dim]({token.days_until_expiry} days)[/dim]"
-        )
+        lines.append(f"[cyan]Expires:[/cyan] {expiry_date} [dim]({days} days)[/dim]")
 
     if token.last_rotated:
         last_rot = token.last_rotated.strftime("%Y-%m-%d %H:%M:%S")
-        stdout_console.print(f"[cyan]Last Rotated:[/cyan] {last_rot}")
+        lines.append(f"[cyan]Last Rotated:[/cyan] {last_rot}")
 
-    stdout_console.print("\n[cyan]Locations:[/cyan]")
+    lines.append("\n[cyan]Locations:[/cyan]")
     for loc in token.locations:
-        stdout_console.print(
-            f"  [green]•[/green] [magenta]{loc.type}[/magenta]: {loc.path}"
-        )
-        if loc.metadata:
-            for key, value in loc.metadata.items():
-                stdout_console.print(f"    [dim]{key}:[/dim] {value}")
+        lines.append(f"  [green]•[/green] [magenta]{loc.type}[/magenta]: {loc.path}")
+        for key, value in loc.metadata.items():
+            lines.append(f"    [dim]{key}:[/dim] {value}")
 
     if token.notes:
-        stdout_console.print(f"\n[cyan]Notes:[/cyan] [dim]{token.notes}[/dim]")
+        lines.append(f"\n[cyan]Notes:[/cyan] [dim]{token.notes}[/dim]")
+
+    stdout_console().print("\n".join(lines))
 
 
 def _print_tabulate_describe(token, tablefmt: str) -> None:
     """Print token details as tabulate table."""
+    from tabulate import tabulate
+
+    days = token.days_until_expiry
     expiry_str = "N/A"
     if token.expires_at:
         expiry_date = token.expires_at.strftime("%Y-%m-%d")
-        expiry_str = f"{expiry_date} ({token.days_until_expiry} days)"
+        expiry_str = f"{expiry_date} ({days} days)"
 
     last_rotated_str = "Never"
     if token.last_rotated:
@@ -561,7 +650,7 @@ def _print_tabulate_describe(token, tablefmt: str) -> None:
         ["Name", token.name],
         ["Service", token.service],
         ["Rotation Type", token.rotation_type.value],
-        ["Status", token.status.value],
+        ["Status", TokenMetadata.status_from_days(days).value],
         ["Expires", expiry_str],
         ["Last Rotated", last_rotated_str],
     ]
@@ -594,36 +683,35 @@ def backend():
 @backend.command("show")
 def backend_show():
     """Show current backend configuration."""
-    config = get_config()
+    config = _get_config()
     current_backend = config.get("backend", "local")
 
-    stdout_console.print("[bold]Backend Configuration[/bold]\n")
-    stdout_console.print(f"[cyan]Current backend:[/cyan] {current_backend}")
+    stdout_console().print("[bold]Backend Configuration[/bold]\n")
+    stdout_console().print(f"[cyan]Current backend:[/cyan] {current_backend}")
 
     if current_backend == "local":
         local_config = config.get("local", {})
         data_dir = local_config.get("data_dir", "~/.config/tokn")
-        stdout_console.print(f"[cyan]Data directory:[/cyan] {data_dir}")
-        stdout_console.print(
+        stdout_console().print(f"[cyan]Data directory:[/cyan] {data_dir}")
+        stdout_console().print(
             "\n[dim]Local backend: Solo developer, works offline[/dim]"
         )
     elif current_backend == "doppler":
         doppler_config = config.get("doppler", {})
         project = doppler_config.get("project", "tokn")
         doppler_env = doppler_config.get("config", "dev")
-        stdout_console.print(f"[cyan]Doppler project:[/cyan] {project}")
-        stdout_console.print(f"[cyan]Doppler config:[/cyan] {doppler_env}")
-        stdout_console.print(
+        stdout_console().print(f"[cyan]Doppler project:[/cyan] {project}")
+        stdout_console().print(f"[cyan]Doppler config:[/cyan] {doppler_env}")
+        stdout_console().print(
             "\n[dim]Doppler backend: Multi-device sync, team collaboration[/dim]"
         )
 
     # Show token count
     try:
-        backend_instance = get_backend()
-        registry = backend_instance.load_registry()
-        stdout_console.print(f"\n[cyan]Tokens stored:[/cyan] {len(registry.tokens)}")
+        registry = _get_registry()
+        stdout_console().print(f"\n[cyan]Tokens stored:[/cyan] {len(registry.tokens)}")
     except Exception as e:
-        console.print(f"\n[yellow]Could not load registry: {e}[/yellow]")
+        console().print(f"\n[yellow]Could not load registry: {e}[/yellow]")
 
 
 @backend.command("migrate")
@@ -650,20 +738,22 @@ def backend_migrate(from_backend: str, to_backend: str, force: bool):
         tokn backend migrate --from local --to doppler
     """
     if from_backend == to_backend:
-        console.print(f"[red]Source and destination are the same: {from_backend}[/red]")
+        console().print(
+            f"[red]Source and destination are the same: {from_backend}[/red]"
+        )
         sys.exit(1)
 
     # Check if destination has data
     if not force:
         try:
-            dest = get_backend(to_backend)
+            dest = get_backend(to_backend, config=_get_config())
             dest_registry = dest.load_registry()
             if dest_registry.tokens:
-                console.print(
+                console().print(
                     f"[yellow]Destination backend '{to_backend}' already has "
                     f"{len(dest_registry.tokens)} token(s).[/yellow]"
                 )
-                console.print("[yellow]Use --force to overwrite.[/yellow]")
+                console().print("[yellow]Use --force to overwrite.[/yellow]")
                 sys.exit(1)
         except Exception:
             pass  # Destination doesn't exist or can't be read, OK to proceed
@@ -672,10 +762,10 @@ def backend_migrate(from_backend: str, to_backend: str, force: bool):
         success, message, token_count = migrate_backend(from_backend, to_backend)
 
     if success:
-        stdout_console.print(f"[green]✓ {message}[/green]")
-        stdout_console.print(f"  [cyan]Active backend:[/cyan] {to_backend}")
+        stdout_console().print(f"[green]✓ {message}[/green]")
+        stdout_console().print(f"  [cyan]Active backend:[/cyan] {to_backend}")
     else:
-        console.print(f"[red]✗ {message}[/red]")
+        console().print(f"[red]✗ {message}[/red]")
         sys.exit(1)
 
 
@@ -711,23 +801,24 @@ def backend_set(
             config.setdefault("local", {})["data_dir"] = data_dir
 
     save_config(config)
+    # Build the new backend from the config just written, not a re-read
+    _state()["config"] = config
 
-    stdout_console.print(f"[green]✓ Backend set to:[/green] {backend_type}")
+    stdout_console().print(f"[green]✓ Backend set to:[/green] {backend_type}")
 
     # Warn if no data in new backend
     try:
-        backend_instance = get_backend()
-        registry = backend_instance.load_registry()
+        registry = _get_registry()
         if not registry.tokens:
-            console.print(
+            console().print(
                 f"[yellow]Note: No tokens found in {backend_type} backend.[/yellow]"
             )
-            console.print(
+            console().print(
                 "[yellow]Use 'tokn backend migrate' to move data "
                 "from another backend.[/yellow]"
             )
     except Exception as e:
-        console.print(f"[yellow]Warning: Could not verify backend: {e}[/yellow]")
+        console().print(f"[yellow]Warning: Could not verify backend: {e}[/yellow]")
 
 
 if __name__ == "__main__":
@@ -1,6 +1,8 @@
 """Abstract base class for metadata backends."""
 
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from contextlib import contextmanager
 
 from tokn.core.token import TokenRegistry
 
@@ -16,6 +18,11 @@ class MetadataBackend(ABC):
     - DopplerBackend: Multi-device sync, team collaboration via cloud
     """
 
+    # Buffered registry while inside defer_saves(); None means save immediately
+    _deferred: TokenRegistry | None = None
+    _pending_saves: int = 0
+    _max_pending_saves: int = 0
+
     @property
     @abstractmethod
     def backend_type(self) -> str:
@@ -46,3 +53,68 @@ class MetadataBackend(ABC):
         Default implementation just loads. Remote backends may fetch from cloud.
         """
         return self.load_registry()
+
+    @contextmanager
+    def defer_saves(self, max_pending: int = 50) -> Iterator[None]:
+        """Buffer registry updates and write them once on exit.
+
+        Inside the block, load_for_update() returns one shared registry and
+        queue_save() only marks it dirty. The registry is flushed when the
+        block exits (even on error) or every max_pending queued saves.
+        If the block raised, a failed flush is noted on that error instead
+        of replacing it. Nested calls join the outer block.
+        """
+        if self._deferred is not None:
+            yield
+            return
+
+        self._deferred = self._load_latest()
+        self._pending_saves = 0
+        self._max_pending_saves = max_pending
+        try:
+            yield
+        except BaseException as e:
+            try:
+                self._flush_deferred()
+            except Exception as flush_error:
+                e.add_note(f"Deferred registry save also failed: {flush_error}")
+            raise
+        else:
+            self._flush_deferred()
+
+    def _flush_deferred(self) -> None:
+        """Leave defer_saves(), writing the buffered registry if it is dirty."""
+        registry, self._deferred = self._deferred, None
+        pending, self._pending_saves = self._pending_saves, 0
+        if pending:
+            self.save_registry(registry)
+
+    def load_for_update(self) -> TokenRegistry:
+        """Load the registry for a read-modify-write, honouring defer_saves()."""
+        if self._deferred is not None:
+            return self._deferred
+        return self._load_latest()
+
+    def _load_latest(self) -> TokenRegistry:
+        """Load the registry a save will be built on.
+
+        Backends that serve load_registry() from a cache override this to
+        read through it, so a save never overwrites newer stored metadata.
+        """
+        return self.load_registry()
+
+    def queue_save(self, registry: TokenRegistry) -> bool:
+        """Save the registry now, or mark it dirty inside defer_saves().
+
+        Returns True if the registry was written, False if it is still pending.
+        """
+        if self._deferred is None:
+            self.save_registry(registry)
+            return True
+
+        self._pending_saves += 1
+        if self._pending_saves < self._max_pending_saves:
+            return False
+        self.save_registry(registry)
+        self._pending_saves = 0
+        return True
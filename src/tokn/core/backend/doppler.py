@@ -1,12 +1,25 @@
 """Doppler backend for metadata storage and multi-device sync."""
 
 import json
-import shutil
+import os
 import subprocess
+import threading
+import time
 from datetime import datetime
+from pathlib import Path
+
+from pydantic import ValidationError
 
 from tokn.core.backend.base import MetadataBackend
 from tokn.core.token import TokenRegistry
+from tokn.utils.fs import atomic_write
+
+DOPPLER_CLI_MISSING = (
+    "Doppler CLI not found. Please install it:\n"
+    "  macOS: brew install dopplerhq/cli/doppler\n"
+    "  Linux: https://docs.doppler.com/docs/install-cli\n"
+    "Then run: doppler login"
+)
 
 
 class DopplerBackend(MetadataBackend):
@@ -18,10 +31,18 @@ class DopplerBackend(MetadataBackend):
 
     METADATA_SECRET = "TOKN_METADATA"
 
+    # Short-lived on-disk copy of the metadata secret, shared across invocations
+    CACHE_FILE = Path("~/.cache/tokn/doppler.json")
+    CACHE_TTL_SECONDS = 30
+
     def __init__(self, project: str = "tokn", config: str = "dev"):
         self.project = project
         self.config = config
-        self._check_doppler_cli()
+        # Last registry read or written, so repeat loads skip the subprocess
+        self._registry_cache: TokenRegistry | None = None
+        # (project, config) -> all secret values, filled by get_secrets_bulk
+        self._bulk_secrets: dict[tuple[str | None, str | None], dict[str, str]] = {}
+        self._bulk_lock = threading.Lock()
 
     @property
     def backend_type(self) -> str:
@@ -33,25 +54,86 @@ class DopplerBackend(MetadataBackend):
             + args
             + ["--project", self.project, "--config", self.config, "--plain"]
         )
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        result = self._exec(cmd, capture_output=True, text=True)
         return result.stdout.strip()
 
-    def load_registry(self) -> TokenRegistry:
+    def _exec(self, cmd: list[str], **kwargs) -> subprocess.CompletedProcess:
+        """Run a doppler command, reporting a missing CLI as RuntimeError.
+
+        The OS resolves the executable at exec time, so there is no upfront
+        PATH scan and commands that never reach Doppler pay nothing.
+        """
+        # Python's own fds are non-inheritable (PEP 446), so there is nothing
+        # to close; skipping the fd sweep lets CPython use posix_spawn on POSIX
+        kwargs.setdefault("close_fds", os.name != "posix")
         try:
-            data = self._run_doppler(["get", self.METADATA_SECRET])
-            if not data:
+            return subprocess.run(cmd, check=True, **kwargs)
+        except FileNotFoundError:
+            raise RuntimeError(DOPPLER_CLI_MISSING) from None
+
+    def load_registry(self) -> TokenRegistry:
+        if self._registry_cache is None:
+            self._registry_cache = self._fetch_registry()
+        # Callers mutate the registry before saving; never hand out the cache
+        return self._registry_cache.model_copy(deep=True)
+
+    def _fetch_registry(self, use_cache: bool = True) -> TokenRegistry:
+        data = self._read_cache() if use_cache else None
+        if data is None:
+            try:
+                data = self._run_doppler(["get", self.METADATA_SECRET])
+            except subprocess.CalledProcessError:
                 return TokenRegistry()
+            self._write_cache(data)
 
-            registry_dict = json.loads(data)
-            return TokenRegistry.model_validate(registry_dict)
-        except subprocess.CalledProcessError:
-            return TokenRegistry()
-        except json.JSONDecodeError:
+        if not data:
             return TokenRegistry()
 
+        try:
+            return TokenRegistry.model_validate_json(data)
+        except ValidationError as e:
+            # Only unparseable JSON means "no registry"; schema errors must
+            # surface rather than let a later save overwrite the secret
+            if any(err["type"] == "json_invalid" for err in e.errors()):
+                return TokenRegistry()
+            raise
+
+    def _read_cache(self) -> str | None:
+        """Return the cached metadata secret if fresh and for this project/config."""
+        try:
+            entry = json.loads(self.CACHE_FILE.expanduser().read_text())
+        except (OSError, ValueError):
+            return None
+
+        if not isinstance(entry, dict):
+            return None
+        if entry.get("key") != [self.project, self.config]:
+            return None
+        cached_at, blob = entry.get("cached_at"), entry.get("blob")
+        if not isinstance(cached_at, int | float) or not isinstance(blob, str):
+            return None
+        if time.time() - cached_at > self.CACHE_TTL_SECONDS:
+            return None
+        return blob
+
+    def _write_cache(self, data: str) -> None:
+        """Best-effort write of the metadata secret to the on-disk cache."""
+        cache_file = self.CACHE_FILE.expanduser()
+        entry = {
+            "key": [self.project, self.config],
+            "cached_at": time.time(),
+            "blob": data,
+        }
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write(cache_file, json.dumps(entry).encode())
+        except OSError:
+            pass
+
     def save_registry(self, registry: TokenRegistry) -> None:
         registry.last_sync = datetime.now()
-        data = registry.model_dump_json(indent=2)
+        # Compact JSON: the secret is machine-read and counts against 50KB
+        data = registry.model_dump_json()
         size_bytes = len(data.encode("utf-8"))
 
         max_size = 50 * 1024
@@ -72,10 +154,26 @@ class DopplerBackend(MetadataBackend):
             "--config",
             self.config,
         ]
-        subprocess.run(cmd, input=data, text=True, check=True, capture_output=True)
+        # Nothing is read from stdout on writes; keep stderr for error messages
+        self._exec(
+            cmd,
+            input=data,
+            text=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+        self._registry_cache = registry.model_copy(deep=True)
+        self._write_cache(data)
+
+    def _load_latest(self) -> TokenRegistry:
+        # Read-modify-writes skip the disk cache: it may be CACHE_TTL_SECONDS
+        # old, and saving on top of it would drop another device's changes
+        self._registry_cache = self._fetch_registry(use_cache=False)
+        return self._registry_cache.model_copy(deep=True)
 
     def sync(self) -> TokenRegistry:
-        return self.load_registry()
+        # Always go to Doppler: sync is how users pick up other devices' changes
+        return self._load_latest()
 
     def get_secret(
         self, name: str, project: str | None = None, config: str | None = None
@@ -87,9 +185,37 @@ class DopplerBackend(MetadataBackend):
             args.extend(["--config", config])
 
         cmd = ["doppler", "secrets"] + args + ["--plain"]
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        result = self._exec(cmd, capture_output=True, text=True)
         return result.stdout.strip()
 
+    def get_secrets_bulk(
+        self, project: str | None = None, config: str | None = None
+    ) -> dict[str, str]:
+        """Return every secret in a project/config, downloaded once per instance.
+
+        One `doppler secrets download` replaces a `secrets get` per location.
+        Values stay in memory only; set_secret keeps the cached copy current.
+        """
+        key = (project, config)
+        with self._bulk_lock:
+            if key not in self._bulk_secrets:
+                cmd = [
+                    "doppler",
+                    "secrets",
+                    "download",
+                    "--no-file",
+                    "--format",
+                    "json",
+                ]
+                if project:
+                    cmd.extend(["--project", project])
+                if config:
+                    cmd.extend(["--config", config])
+
+                result = self._exec(cmd, capture_output=True, text=True)
+                self._bulk_secrets[key] = json.loads(result.stdout)
+            return self._bulk_secrets[key]
+
     def set_secret(
         self,
         name: str,
@@ -103,14 +229,15 @@ class DopplerBackend(MetadataBackend):
         if config:
             cmd.extend(["--config", config])
 
-        subprocess.run(cmd, input=value, text=True, check=True, capture_output=True)
-
-    def _check_doppler_cli(self) -> None:
-        """Check if Doppler CLI is available."""
-        if not shutil.which("doppler"):
-            raise RuntimeError(
-                "Doppler CLI not found. Please install it:\n"
-                "  macOS: brew install dopplerhq/cli/doppler\n"
-                "  Linux: https://docs.doppler.com/docs/install-cli\n"
-                "Then run: doppler login"
-            )
+        # Nothing is read from stdout on writes; keep stderr for error messages
+        self._exec(
+            cmd,
+            input=value,
+            text=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+        with self._bulk_lock:
+            secrets = self._bulk_secrets.get((project, config))
+            if secrets is not None:
+                secrets[name] = value
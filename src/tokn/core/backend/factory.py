@@ -1,16 +1,13 @@
 """Backend factory and configuration management."""
 
+import copy
 import os
+import re
+from functools import cache, lru_cache
 from pathlib import Path
+from types import ModuleType
 from typing import Any
 
-try:
-    import tomllib
-except ImportError:
-    import tomli as tomllib  # type: ignore[import-not-found]
-
-import tomli_w
-
 from tokn.core.backend.base import MetadataBackend
 
 CONFIG_DIR = Path("~/.config/tokn").expanduser()
@@ -28,39 +25,113 @@ DEFAULT_CONFIG: dict[str, Any] = {
 }
 
 
+_BARE_KEY = re.compile(r"[A-Za-z0-9_-]+")
+_UNSAFE_STRING = re.compile(r"[\x00-\x1f\x7f]")
+
+
+def _render_config(config: dict[str, Any]) -> bytes:
+    """Render the config as TOML.
+
+    The config is only ever string settings plus one level of string-valued
+    tables (``backend``, ``[local]``, ``[doppler]``), so that shape is emitted
+    directly; anything else falls back to the generic tomli_w writer.
+    """
+
+    def simple(key: str, value: Any) -> bool:
+        return (
+            isinstance(value, str)
+            and _BARE_KEY.fullmatch(key) is not None
+            and _UNSAFE_STRING.search(value) is None
+        )
+
+    def line(key: str, value: str) -> str:
+        escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+        return f'{key} = "{escaped}"\n'
+
+    top = [(k, v) for k, v in config.items() if not isinstance(v, dict)]
+    tables = [(k, v) for k, v in config.items() if isinstance(v, dict)]
+    if not (
+        all(simple(k, v) for k, v in top)
+        and all(
+            _BARE_KEY.fullmatch(name) and all(simple(k, v) for k, v in table.items())
+            for name, table in tables
+        )
+    ):
+        import tomli_w
+
+        return tomli_w.dumps(config).encode()
+
+    parts = [line(k, v) for k, v in top]
+    for name, table in tables:
+        if parts:
+            parts.append("\n")
+        parts.append(f"[{name}]\n")
+        parts.extend(line(k, v) for k, v in table.items())
+    return "".join(parts).encode()
+
+
+@cache
+def _toml_reader() -> ModuleType:
+    """Import the TOML parser on first use (only needed if a config file exists)."""
+    try:
+        import tomllib
+    except ImportError:
+        import tomli as tomllib  # type: ignore[import-not-found]
+    return tomllib
+
+
+@lru_cache(maxsize=4)
+def _load_config_cached(path: Path, mtime_ns: int) -> dict[str, Any]:
+    """Parse a config file; mtime_ns in the key drops stale entries on change."""
+    with open(path, "rb") as f:
+        return _toml_reader().load(f)
+
+
 def get_config() -> dict[str, Any]:
     """Load configuration from config file.
 
-    Returns default config if file doesn't exist.
+    Returns default config if file doesn't exist. The parsed file is cached
+    per mtime, and callers always get their own copy to mutate.
     """
-    if not CONFIG_FILE.exists():
-        return DEFAULT_CONFIG.copy()
+    try:
+        mtime_ns = CONFIG_FILE.stat().st_mtime_ns
+    except OSError:
+        return copy.deepcopy(DEFAULT_CONFIG)
 
     try:
-        with open(CONFIG_FILE, "rb") as f:
-            config = tomllib.load(f)
-        merged = DEFAULT_CONFIG.copy()
-        merged.update(config)
-        return merged
+        config = _load_config_cached(CONFIG_FILE, mtime_ns)
     except Exception:
-        return DEFAULT_CONFIG.copy()
+        return copy.deepcopy(DEFAULT_CONFIG)
+
+    merged = copy.deepcopy(DEFAULT_CONFIG)
+    merged.update(copy.deepcopy(config))
+    return merged
 
 
 def save_config(config: dict[str, Any]) -> None:
     """Save configuration to config file."""
     CONFIG_DIR.mkdir(parents=True, exist_ok=True)
 
-    with open(CONFIG_FILE, "wb") as f:
-        tomli_w.dump(config, f)
+    data = _render_config(config)
+    fd = os.open(CONFIG_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        os.fchmod(fd, 0o600)
+        os.write(fd, data)
+    finally:
+        os.close(fd)
 
-    os.chmod(CONFIG_FILE, 0o600)
+    # Same-tick rewrites can keep the old mtime_ns on coarse filesystems
+    _load_config_cached.cache_clear()
 
 
-def get_backend(backend_type: str | None = None) -> MetadataBackend:
+def get_backend(
+    backend_type: str | None = None, config: dict[str, Any] | None = None
+) -> MetadataBackend:
     """Get the configured metadata backend.
 
     Args:
         backend_type: Override backend type. If None, uses config file.
+        config: Already-loaded config. If None, reads the config file.
 
     Returns:
         MetadataBackend instance.
@@ -71,7 +142,8 @@ def get_backend(backend_type: str | None = None) -> MetadataBackend:
     from tokn.core.backend.doppler import DopplerBackend
     from tokn.core.backend.local import LocalBackend
 
-    config = get_config()
+    if config is None:
+        config = get_config()
 
     if backend_type is None:
         backend_type = config.get("backend", "local")
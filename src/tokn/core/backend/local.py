@@ -1,15 +1,12 @@
 """Local file-based backend for metadata storage."""
 
-import json
 import os
-import stat
 from datetime import datetime
 from pathlib import Path
 
 from tokn.core.backend.base import MetadataBackend
 from tokn.core.token import TokenRegistry
-
-SECURE_FILE_MODE = stat.S_IRUSR | stat.S_IWUSR  # 0600
+from tokn.utils.fs import atomic_write
 
 
 class LocalBackend(MetadataBackend):
@@ -33,21 +30,36 @@ class LocalBackend(MetadataBackend):
         return "local"
 
     def load_registry(self) -> TokenRegistry:
-        if not self.registry_file.exists():
+        try:
+            data = self._read_file()
+        except FileNotFoundError:
             return TokenRegistry()
 
         try:
-            data = json.loads(self.registry_file.read_text())
-            return TokenRegistry.model_validate(data)
-        except (json.JSONDecodeError, ValueError):
+            return TokenRegistry.model_validate_json(data)
+        except ValueError:
             return TokenRegistry()
 
+    def _read_file(self) -> bytes:
+        """Read the registry in one unbuffered read sized from fstat."""
+        fd = os.open(self.registry_file, os.O_RDONLY | getattr(os, "O_CLOEXEC", 0))
+        try:
+            size = os.fstat(fd).st_size
+            chunks = []
+            while chunk := os.read(fd, max(size, 1)):
+                chunks.append(chunk)
+            return b"".join(chunks)
+        finally:
+            os.close(fd)
+
     def save_registry(self, registry: TokenRegistry) -> None:
         registry.last_sync = datetime.now()
 
         self.data_dir.mkdir(parents=True, exist_ok=True)
 
-        data = registry.model_dump_json(indent=2)
-        self.registry_file.write_text(data)
+        data = registry.model_dump_json().encode()
+        self._write_file(data)
 
-        os.chmod(self.registry_file, SECURE_FILE_MODE)
+    def _write_file(self, data: bytes) -> None:
+        """Atomically replace the registry (see atomic_write)."""
+        atomic_write(self.registry_file, data)
@@ -1,52 +1,88 @@
 """Batch rotation orchestrator with rollback support."""
 
+import importlib
 import subprocess
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Any
 
 import httpx
 
-from tokn.core.backend import get_backend
-from tokn.core.token import RotationType, TokenMetadata
+from tokn.core.backend import MetadataBackend, get_backend
+from tokn.core.token import RotationType, TokenLocation, TokenMetadata
 from tokn.locations.base import LocationHandler
-from tokn.locations.doppler import DopplerLocationHandler
-from tokn.locations.edgerc import EdgercHandler
-from tokn.locations.local_files import (
-    GitCredentialsHandler,
-    LinodeCLIHandler,
-    TerraformCredentialsHandler,
-)
-from tokn.locations.postman_env import PostmanEnvironmentHandler
-from tokn.providers.akamai import AkamaiEdgeGridProvider
 from tokn.providers.base import TokenProvider
-from tokn.providers.cloudflare import CloudflareProvider
-from tokn.providers.github import GitHubProvider
-from tokn.providers.linode import LinodeProvider
-from tokn.providers.other import OtherProvider
-from tokn.providers.postman import PostmanProvider
-from tokn.providers.terraform import TerraformAccountProvider
+
+# name -> (module, class); imported and constructed on first use, so a
+# rotation only pays for the providers and handlers its tokens need
+_PROVIDERS = {
+    "github": ("tokn.providers.github", "GitHubProvider"),
+    "cloudflare-account-token": ("tokn.providers.cloudflare", "CloudflareProvider"),
+    "linode": ("tokn.providers.linode", "LinodeProvider"),
+    "terraform": ("tokn.providers.terraform", "TerraformAccountProvider"),
+    "akamai": ("tokn.providers.akamai", "AkamaiEdgeGridProvider"),
+    "postman": ("tokn.providers.postman", "PostmanProvider"),
+    "other": ("tokn.providers.other", "OtherProvider"),
+}
+_LOCATION_HANDLERS = {
+    "doppler": ("tokn.locations.doppler", "DopplerLocationHandler"),
+    "git-credentials": ("tokn.locations.local_files", "GitCredentialsHandler"),
+    "linode-cli": ("tokn.locations.local_files", "LinodeCLIHandler"),
+    "terraform-credentials": (
+        "tokn.locations.local_files",
+        "TerraformCredentialsHandler",
+    ),
+    "edgerc": ("tokn.locations.edgerc", "EdgercHandler"),
+    "postman-env": ("tokn.locations.postman_env", "PostmanEnvironmentHandler"),
+}
+
+
+class _LazyInstances(dict):
+    """Dict that builds each value from a (module, class) table on first access."""
+
+    def __init__(
+        self,
+        table: dict[str, tuple[str, str]],
+        init_kwargs: dict[str, dict[str, Any]] | None = None,
+    ):
+        super().__init__()
+        self._table = table
+        self._init_kwargs = init_kwargs or {}
+        self._lock = threading.Lock()
+
+    def __missing__(self, key: str) -> Any:
+        module_name, class_name = self._table[key]
+        with self._lock:
+            if key not in self:
+                module = importlib.import_module(module_name)
+                cls = getattr(module, class_name)
+                self[key] = cls(**self._init_kwargs.get(key, {}))
+        return dict.__getitem__(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self or key in self._table:
+            return self[key]
+        return default
 
 
 class RotationOrchestrator:
-    def __init__(self):
-        self.backend = get_backend()
-        self.providers: dict[str, TokenProvider] = {
-            "github": GitHubProvider(),
-            "cloudflare-account-token": CloudflareProvider(),
-            "linode": LinodeProvider(),
-            "terraform": TerraformAccountProvider(),
-            "akamai": AkamaiEdgeGridProvider(),
-            "postman": PostmanProvider(),
-            "other": OtherProvider(),
-        }
-        self.location_handlers: dict[str, LocationHandler] = {
-            "doppler": DopplerLocationHandler(),
-            "git-credentials": GitCredentialsHandler(),
-            "linode-cli": LinodeCLIHandler(),
-            "terraform-credentials": TerraformCredentialsHandler(),
-            "edgerc": EdgercHandler(),
-            "postman-env": PostmanEnvironmentHandler(),
-        }
+    def __init__(self, backend: MetadataBackend | None = None):
+        self.backend = backend if backend is not None else get_backend()
+        self.providers: dict[str, TokenProvider] = _LazyInstances(_PROVIDERS)
+        # A Doppler metadata backend doubles as the doppler location's client,
+        # so both share one bulk-secrets cache
+        handler_kwargs = {}
+        if self.backend.backend_type == "doppler":
+            handler_kwargs["doppler"] = {"backend": self.backend}
+        self.location_handlers: dict[str, LocationHandler] = _LazyInstances(
+            _LOCATION_HANDLERS, handler_kwargs
+        )
+        # Serializes registry read-modify-write when rotate_all runs in parallel
+        self._registry_lock = threading.Lock()
+        # Tokens whose metadata is queued but not yet written (under the lock)
+        self._unsaved: list[str] = []
 
     def rotate_token(
         self,
@@ -63,20 +99,29 @@ class RotationOrchestrator:
         if not provider.supports_auto_rotation:
             return False, "Provider does not support auto-rotation", []
 
-        backups: dict[str, str] = {}
+        # (type, path) -> (backup content, location metadata for the restore)
+        backups: dict[tuple[str, str], tuple[str, dict]] = {}
         updated_locations: list[str] = []
 
         try:
-            current_token = self._read_current_token(token_metadata)
+            current_token, source = self._read_current_token(token_metadata)
             if not current_token:
                 return False, "Could not read current token", []
 
             for location in token_metadata.locations:
-                backup = self._backup_location(
-                    location.type, location.path, location.metadata
-                )
+                handler = self.location_handlers.get(location.type)
+                if location is source and handler.backup_is_token_value:
+                    # Already read above; skip a second Doppler/Postman call
+                    backup = current_token
+                else:
+                    backup = self._backup_location(
+                        location.type, location.path, location.metadata
+                    )
                 if backup:
-                    backups[f"{location.type}:{location.path}"] = backup
+                    backups[(location.type, location.path)] = (
+                        backup,
+                        location.metadata,
+                    )
 
             rotation_kwargs = self._get_rotation_kwargs(token_metadata)
             result = provider.rotate(current_token, **rotation_kwargs)
@@ -87,6 +132,9 @@ class RotationOrchestrator:
             if not result.new_token:
                 return False, "Rotation succeeded but no token returned", []
 
+            # Group writes by location type so a handler can batch them
+            # (e.g. several sections of one .edgerc rewritten once)
+            writes: dict[str, list[tuple[TokenLocation, str, dict]]] = {}
             for location in token_metadata.locations:
                 update_metadata = dict(location.metadata)
                 token_value = result.new_token
@@ -102,15 +150,25 @@ class RotationOrchestrator:
                         ):
                             token_value = new_client_token
 
-                success = self._update_location(
-                    location.type, location.path, token_value, update_metadata
+                writes.setdefault(location.type, []).append(
+                    (location, token_value, update_metadata)
                 )
-                if success:
-                    updated_locations.append(f"{location.type}:{location.path}")
-                else:
-                    self._rollback_all(backups)
-                    loc_str = f"{location.type}:{location.path}"
-                    return False, f"Failed to update location: {loc_str}", []
+
+            # Stop at the first failed group: later groups are never written,
+            # so there is less to push out and then roll back
+            for location_type, items in writes.items():
+                for (location, _, _), success in zip(
+                    items, self._update_locations(location_type, items), strict=True
+                ):
+                    if not success:
+                        self._rollback_all(backups)
+                        loc_str = f"{location.type}:{location.path}"
+                        return False, f"Failed to update location: {loc_str}", []
+
+            updated_locations.extend(
+                f"{location.type}:{location.path}"
+                for location in token_metadata.locations
+            )
 
             token_metadata.last_rotated = datetime.now()
             if result.rotated_at:
@@ -119,9 +177,13 @@ class RotationOrchestrator:
             if result.expires_at:
                 token_metadata.expires_at = result.expires_at
 
-            registry = self.backend.load_registry()
-            registry.add_token(token_metadata)
-            self.backend.save_registry(registry)
+            with self._registry_lock:
+                registry = self.backend.load_for_update()
+                registry.add_token(token_metadata)
+                if self.backend.queue_save(registry):
+                    self._unsaved.clear()
+                else:
+                    self._unsaved.append(token_metadata.name)
 
             return True, "Token rotated successfully", updated_locations
 
@@ -134,14 +196,33 @@ class RotationOrchestrator:
         except FileNotFoundError as e:
             self._rollback_all(backups)
             return False, f"File not found: {str(e)}", []
+        except RuntimeError as e:
+            self._rollback_all(backups)
+            return False, str(e), []
         except Exception as e:
             self._rollback_all(backups)
             return False, f"Unexpected error: {str(e)}", []
 
-    def rotate_all(self, auto_only: bool = True) -> dict[str, Any]:
+    def rotate_all(
+        self, auto_only: bool = True, max_workers: int = 4
+    ) -> dict[str, Any]:
+        """Rotate every tracked token, running independent services in parallel.
+
+        Tokens of the same service are rotated one after another in a single
+        worker: providers keep per-rotation state (e.g. Akamai's new client
+        token) and same-service tokens often share a location file. Locations
+        any service can use (a Postman environment) may still be written by
+        several workers at once; their handlers serialize those writes.
+
+        Metadata is saved in batches via defer_saves(). If the final save
+        fails, the tokens it would have recorded are reported under "failed"
+        rather than raising, since their new values are already in their
+        locations.
+        """
         registry = self.backend.load_registry()
         results = {"success": [], "failed": [], "manual": [], "skipped": []}
 
+        by_service: dict[str, list[TokenMetadata]] = {}
         for token in registry.list_tokens():
             if auto_only and token.rotation_type == RotationType.MANUAL:
                 instructions = self.providers[token.service].get_manual_instructions()
@@ -149,15 +230,48 @@ class RotationOrchestrator:
                     {"name": token.name, "instructions": instructions}
                 )
                 continue
+            by_service.setdefault(token.service, []).append(token)
 
-            success, message, locations = self.rotate_token(token)
+        if not by_service:
+            return results
 
-            if success:
-                results["success"].append(
-                    {"name": token.name, "message": message, "locations": locations}
-                )
-            else:
-                if "does not support auto-rotation" in message:
+        def rotate_group(tokens: list[TokenMetadata]) -> list[tuple]:
+            return [(token, *self.rotate_token(token)) for token in tokens]
+
+        workers = max(1, min(max_workers, len(by_service)))
+        grouped: list[list[tuple]] | None = None
+        save_error: Exception | None = None
+        self._unsaved = []
+        try:
+            with self.backend.defer_saves(), ThreadPoolExecutor(workers) as pool:
+                grouped = list(pool.map(rotate_group, by_service.values()))
+        except Exception as e:
+            if grouped is None:
+                raise
+            # Only the final flush failed: every rotation above has finished
+            save_error = e
+
+        unsaved = set(self._unsaved) if save_error else set()
+        for outcomes in grouped:
+            for token, success, message, locations in outcomes:
+                if token.name in unsaved:
+                    written = ", ".join(locations) or "no locations"
+                    results["failed"].append(
+                        {
+                            "name": token.name,
+                            "error": f"Rotated and written to {written}, "
+                            f"but metadata was not saved: {save_error}",
+                        }
+                    )
+                elif success:
+                    results["success"].append(
+                        {
+                            "name": token.name,
+                            "message": message,
+                            "locations": locations,
+                        }
+                    )
+                elif "does not support auto-rotation" in message:
                     results["manual"].append(
                         {"name": token.name, "instructions": message}
                     )
@@ -166,14 +280,17 @@ class RotationOrchestrator:
 
         return results
 
-    def _read_current_token(self, token_metadata: TokenMetadata) -> str | None:
+    def _read_current_token(
+        self, token_metadata: TokenMetadata
+    ) -> tuple[str | None, TokenLocation | None]:
+        """Return the first readable token value and the location it came from."""
         for location in token_metadata.locations:
             handler = self.location_handlers.get(location.type)
             if handler:
                 token = handler.read_token(location.path, **location.metadata)
                 if token:
-                    return token
-        return None
+                    return token, location
+        return None, None
 
     def _backup_location(
         self, location_type: str, path: str, metadata: dict
@@ -183,40 +300,68 @@ class RotationOrchestrator:
             return handler.backup_token(path, **metadata)
         return None
 
-    def _update_location(
-        self, location_type: str, path: str, token: str, metadata: dict
-    ) -> bool:
+    def _update_locations(
+        self, location_type: str, items: list[tuple[TokenLocation, str, dict]]
+    ) -> list[bool]:
+        """Write (location, token, metadata) items of one type; per-item success."""
         handler = self.location_handlers.get(location_type)
-        if handler:
-            return handler.write_token(path, token, **metadata)
-        return False
-
-    def _rollback_all(self, backups: dict[str, str]) -> None:
-        for location_key, backup_content in backups.items():
-            location_type, path = location_key.split(":", 1)
+        if not handler:
+            return [False] * len(items)
+        if len(items) == 1:
+            location, token, metadata = items[0]
+            return [handler.write_token(location.path, token, **metadata)]
+        return handler.write_tokens_bulk(
+            [(location.path, token, metadata) for location, token, metadata in items]
+        )
+
+    def _rollback_all(self, backups: dict[tuple[str, str], tuple[str, dict]]) -> None:
+        for (location_type, path), (backup_content, metadata) in backups.items():
             handler = self.location_handlers.get(location_type)
             if handler:
-                handler.rollback_token(path, backup_content)
+                handler.rollback_token(path, backup_content, **metadata)
 
     def _get_rotation_kwargs(self, token_metadata: TokenMetadata) -> dict[str, Any]:
-        kwargs = {}
-
-        if token_metadata.service == "github":
-            kwargs["scopes"] = ["repo"]
-            kwargs["note"] = f"tokn-{token_metadata.name}"
-        elif token_metadata.service == "cloudflare-account-token":
-            kwargs["name"] = f"tokn-{token_metadata.name}"
-            for location in token_metadata.locations:
-                if "account_id" in location.metadata:
-                    kwargs["account_id"] = location.metadata["account_id"]
-                    break
-        elif token_metadata.service == "linode":
-            kwargs["label"] = f"tokn-{token_metadata.name}"
-        elif token_metadata.service == "akamai":
-            for location in token_metadata.locations:
-                if location.type == "edgerc":
-                    kwargs["edgerc_path"] = location.path
-                    kwargs["section"] = location.metadata.get("section", "default")
-                    break
-
-        return kwargs
+        build = _ROTATION_KWARGS.get(token_metadata.service)
+        return build(token_metadata) if build else {}
+
+
+def _github_kwargs(token: TokenMetadata) -> dict[str, Any]:
+    return {"scopes": ["repo"], "note": f"tokn-{token.name}"}
+
+
+def _cloudflare_kwargs(token: TokenMetadata) -> dict[str, Any]:
+    kwargs: dict[str, Any] = {"name": f"tokn-{token.name}"}
+    account_id = next(
+        (
+            loc.metadata["account_id"]
+            for loc in token.locations
+            if "account_id" in loc.metadata
+        ),
+        None,
+    )
+    if account_id is not None:
+        kwargs["account_id"] = account_id
+    return kwargs
+
+
+def _linode_kwargs(token: TokenMetadata) -> dict[str, Any]:
+    return {"label": f"tokn-{token.name}"}
+
+
+def _akamai_kwargs(token: TokenMetadata) -> dict[str, Any]:
+    edgerc = next((loc for loc in token.locations if loc.type == "edgerc"), None)
+    if edgerc is None:
+        return {}
+    return {
+        "edgerc_path": edgerc.path,
+        "section": edgerc.metadata.get("section", "default"),
+    }
+
+
+# service -> builder of the provider.rotate() kwargs for one token
+_ROTATION_KWARGS: dict[str, Callable[[TokenMetadata], dict[str, Any]]] = {
+    "github": _github_kwargs,
+    "cloudflare-account-token": _cloudflare_kwargs,
+    "linode": _linode_kwargs,
+    "akamai": _akamai_kwargs,
+}
@@ -36,7 +36,15 @@ class TokenMetadata(BaseModel):
 
     @property
     def status(self) -> TokenStatus:
-        days = self.days_until_expiry
+        return self.status_from_days(self.days_until_expiry)
+
+    def status_at(self, now: datetime) -> TokenStatus:
+        """Status relative to an aware ``now`` (see days_until_expiry_at)."""
+        return self.status_from_days(self.days_until_expiry_at(now))
+
+    @staticmethod
+    def status_from_days(days: int | None) -> TokenStatus:
+        """Map days until expiry to a status (for callers that already have days)."""
         if days is None:
             return TokenStatus.ACTIVE
 
@@ -50,12 +58,20 @@ class TokenMetadata(BaseModel):
     def days_until_expiry(self) -> int | None:
         if not self.expires_at:
             return None
-        # Handle both timezone-aware and naive datetimes
-        now = datetime.now()
+        # Handle both timezone-aware and naive datetimes: take "now" in the
+        # same timezone as expires_at so the subtraction is always valid
+        expires = self.expires_at
+        now = datetime.now(expires.tzinfo)
+        return (expires - now).days
+
+    def days_until_expiry_at(self, now: datetime) -> int | None:
+        """Days until expiry relative to an aware ``now`` (one clock read per batch)."""
+        if not self.expires_at:
+            return None
         expires = self.expires_at
-        # If expires_at is timezone-aware, make now timezone-aware too
-        if expires.tzinfo is not None:
-            now = now.replace(tzinfo=expires.tzinfo)
+        if expires.tzinfo is None:
+            # Naive timestamps are local wall-clock time
+            now = now.astimezone().replace(tzinfo=None)
         return (expires - now).days
 
 
@@ -1,9 +1,25 @@
 """Abstract base class for location handlers."""
 
 from abc import ABC, abstractmethod
+from functools import lru_cache
+from pathlib import Path
+
+
+@lru_cache(maxsize=64)
+def expand_path(path: str) -> Path:
+    """Return ``path`` with ``~`` expanded, memoized per path string.
+
+    Handlers resolve the same few location paths on every read, backup and
+    write of a rotation; this does the home-directory lookup once per path.
+    """
+    return Path(path).expanduser()
 
 
 class LocationHandler(ABC):
+    # True when backup_token() returns exactly what read_token() returns, so a
+    # value already read can double as the backup without another round trip
+    backup_is_token_value: bool = False
+
     def __init__(self, location_type: str):
         self.location_type = location_type
 
@@ -15,6 +31,14 @@ class LocationHandler(ABC):
     def write_token(self, path: str, token: str, **kwargs) -> bool:
         pass
 
+    def write_tokens_bulk(self, items: list[tuple[str, str, dict]]) -> list[bool]:
+        """Write several (path, token, metadata) items; returns per-item success.
+
+        Handlers that can combine writes (e.g. one rewrite per file) override
+        this; the default writes each item separately.
+        """
+        return [self.write_token(path, token, **meta) for path, token, meta in items]
+
     @abstractmethod
     def backup_token(self, path: str, **kwargs) -> str | None:
         pass
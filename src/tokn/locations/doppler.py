@@ -12,16 +12,21 @@ class DopplerLocationHandler(LocationHandler):
     stored in Doppler secrets, not metadata storage.
     """
 
-    def __init__(self):
+    backup_is_token_value = True
+
+    def __init__(self, backend: DopplerBackend | None = None):
         super().__init__("doppler")
-        self.backend = DopplerBackend()
+        self.backend = backend if backend is not None else DopplerBackend()
 
     def read_token(self, path: str, **kwargs) -> str | None:
         project = kwargs.get("project")
         config = kwargs.get("config")
 
         try:
-            return self.backend.get_secret(path, project, config)
+            return self.backend.get_secrets_bulk(project, config).get(path)
+        except RuntimeError:
+            # Missing CLI: abort rotation before the provider revokes anything
+            raise
         except Exception:
             return None
 
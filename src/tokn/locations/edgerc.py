@@ -4,14 +4,94 @@ Handles reading and writing credentials to .edgerc INI-style configuration files
 Only modifies the specified section, preserving all other sections intact.
 """
 
-import configparser
-import os
-import stat
+from functools import lru_cache
 from pathlib import Path
 
-from tokn.locations.base import LocationHandler
+from tokn.locations.base import LocationHandler, expand_path
+from tokn.utils.fs import atomic_write
 
-SECURE_FILE_MODE = stat.S_IRUSR | stat.S_IWUSR  # 0600
+
+def _parse(data: bytes) -> dict[str, dict[str, str]]:
+    """Parse .edgerc INI content into {section: {key: value}}, in file order.
+
+    Follows configparser's rules for what .edgerc files use: ``[section]``
+    headers (anything after the closing bracket is ignored, so
+    ``[section];comment`` works), ``key = value`` or ``key: value`` pairs
+    split on the first delimiter, and full-line ``#``/``;`` comments. A line
+    indented deeper than its key continues that key's value (joined with a
+    newline); comment lines inside a value are dropped, blank ones kept.
+    Keys keep their case and values are taken literally: no interpolation,
+    and a ``;`` after a value is part of it. Like configparser's strict
+    mode, a repeated section or a repeated key within a section raises
+    ValueError.
+    """
+    sections: dict[str, dict[str, str]] = {}
+    current: dict[str, str] | None = None
+    key: str | None = None
+    key_indent = 0
+    blank_lines = 0
+    for raw in data.decode().splitlines():
+        line = raw.strip()
+        if not line:
+            blank_lines += 1
+            continue
+        if line[0] in "#;":
+            continue
+        indent = len(raw) - len(raw.lstrip())
+        if current is not None and key is not None and indent > key_indent:
+            current[key] += "\n" * (blank_lines + 1) + line
+            blank_lines = 0
+            continue
+        key = None
+        blank_lines = 0
+        if line[0] == "[":
+            end = line.rfind("]")
+            if end > 1:
+                name = line[1:end]
+                if name in sections:
+                    raise ValueError(f"Duplicate .edgerc section: [{name}]")
+                current = sections[name] = {}
+                continue
+        if current is None:
+            continue
+        eq, colon = line.find("="), line.find(":")
+        sep = min(i for i in (eq, colon, len(line)) if i >= 0)
+        if sep == len(line):
+            continue
+        key = line[:sep].rstrip()
+        if key in current:
+            raise ValueError(f"Duplicate .edgerc key: {key}")
+        current[key] = line[sep + 1 :].lstrip()
+        key_indent = indent
+    return sections
+
+
+@lru_cache(maxsize=16)
+def _parse_cached(
+    path: str, ino: int, mtime_ns: int, size: int
+) -> dict[str, dict[str, str]]:
+    """Parse a .edgerc file once per (path, inode, mtime, size) version.
+
+    A rotation reads the same file several times (read, credentials, write).
+    An equal-size rewrite in the same mtime tick keeps mtime and size, so
+    EdgercHandler clears the cache after its own writes; the inode (which
+    atomic_write replaces) catches most outside rewrites.
+    """
+    with open(path, "rb") as f:
+        return _parse(f.read())
+
+
+def _serialize(sections: dict[str, dict[str, str]]) -> bytes:
+    """Render sections back to .edgerc format (``key = value``, no extra spacing)."""
+    parts = []
+    for section, values in sections.items():
+        parts.append(f"[{section}]\n")
+        for key, value in values.items():
+            # Multi-line values go back out as indented continuation lines
+            value = value.replace("\n", "\n\t")
+            parts.append(f"{key} = {value}\n")
+        parts.append("\n")
+    return "".join(parts).encode()
 
 
 class EdgercHandler(LocationHandler):
@@ -37,17 +117,11 @@ class EdgercHandler(LocationHandler):
         Returns:
             The client_secret value or None if not found
         """
-        file_path = Path(path).expanduser()
-        if not file_path.exists():
-            return None
-
+        file_path = expand_path(path)
         section = kwargs.get("section", "default")
 
         try:
-            config = self._read_edgerc(file_path)
-            if section not in config:
-                return None
-            return config.get(section, "client_secret", fallback=None)
+            return self._read_edgerc(file_path).get(section, {}).get("client_secret")
         except Exception:
             return None
 
@@ -67,78 +141,73 @@ class EdgercHandler(LocationHandler):
         Returns:
             True if successful, False otherwise
         """
-        file_path = Path(path).expanduser()
-        section = kwargs.get("section", "default")
-        client_token = kwargs.get("client_token")
-
-        try:
-            if file_path.exists():
-                config = self._read_edgerc(file_path)
-            else:
-                config = configparser.ConfigParser()
-                config.optionxform = str  # type: ignore[method-assign]
-
-            if section not in config:
-                config.add_section(section)
+        return self.write_tokens_bulk([(path, token, kwargs)])[0]
 
-            config.set(section, "client_secret", token)
+    def write_tokens_bulk(self, items: list[tuple[str, str, dict]]) -> list[bool]:
+        """Write several sections, parsing and rewriting each file only once.
 
-            if client_token:
-                config.set(section, "client_token", client_token)
-
-            file_path.parent.mkdir(parents=True, exist_ok=True)
-            self._write_edgerc(file_path, config)
-
-            os.chmod(file_path, SECURE_FILE_MODE)
-            return True
-        except Exception:
-            return False
+        Items are (path, client_secret, kwargs) as for write_token. All items
+        for one file succeed or fail together.
+        """
+        by_file: dict[Path, list[int]] = {}
+        for index, (path, _, _) in enumerate(items):
+            by_file.setdefault(expand_path(path), []).append(index)
+
+        results = [False] * len(items)
+        for file_path, indexes in by_file.items():
+            try:
+                try:
+                    config = self._read_edgerc(file_path)
+                except FileNotFoundError:
+                    config = {}
+                for index in indexes:
+                    _, token, kwargs = items[index]
+                    values = config.setdefault(kwargs.get("section", "default"), {})
+                    values["client_secret"] = token
+
+                    client_token = kwargs.get("client_token")
+                    if client_token:
+                        values["client_token"] = client_token
+
+                file_path.parent.mkdir(parents=True, exist_ok=True)
+                self._write_edgerc(file_path, config)
+            except Exception:
+                continue
+            for index in indexes:
+                results[index] = True
+        return results
 
     def backup_token(self, path: str, **kwargs) -> str | None:
         """Return current file content as backup (in-memory)."""
-        file_path = Path(path).expanduser()
-        if not file_path.exists():
-            return None
-
         try:
-            return file_path.read_text()
+            return expand_path(path).read_text()
         except Exception:
             return None
 
     def rollback_token(self, path: str, backup: str, **kwargs) -> bool:
         """Restore from in-memory backup content."""
-        file_path = Path(path).expanduser()
+        file_path = expand_path(path)
         try:
-            file_path.write_text(backup)
-            os.chmod(file_path, SECURE_FILE_MODE)
+            atomic_write(file_path, backup.encode())
+            _parse_cached.cache_clear()
             return True
         except Exception:
             return False
 
-    def _read_edgerc(self, file_path: Path) -> configparser.ConfigParser:
-        """Read .edgerc file preserving comments and formatting.
+    def _read_edgerc(self, file_path: Path) -> dict[str, dict[str, str]]:
+        """Read and parse .edgerc file into {section: {key: value}}.
 
-        The .edgerc format allows inline comments with semicolons in section names
-        like [section];comment and also standalone comment lines.
+        Returns a copy of the cached parse, so callers may modify it freely.
         """
-        config = configparser.ConfigParser()
-        config.optionxform = str  # type: ignore[method-assign]
-
-        content = file_path.read_text()
-        config.read_string(content)
-        return config
-
-    def _write_edgerc(self, file_path: Path, config: configparser.ConfigParser) -> None:
-        """Write .edgerc file with proper formatting.
+        st = file_path.stat()
+        sections = _parse_cached(str(file_path), st.st_ino, st.st_mtime_ns, st.st_size)
+        return {name: dict(values) for name, values in sections.items()}
 
-        Writes without extra spacing that configparser adds by default.
-        """
-        with open(file_path, "w") as f:
-            for section in config.sections():
-                f.write(f"[{section}]\n")
-                for key, value in config.items(section):
-                    f.write(f"{key} = {value}\n")
-                f.write("\n")
+    def _write_edgerc(self, file_path: Path, config: dict[str, dict[str, str]]) -> None:
+        """Atomically replace .edgerc with the serialized sections (0600)."""
+        atomic_write(file_path, _serialize(config))
+        # Same-tick rewrites can keep mtime_ns and size; drop the old parse
+        _parse_cached.cache_clear()
 
     def get_section_credentials(
         self, path: str, section: str = "default"
@@ -148,20 +217,17 @@ class EdgercHandler(LocationHandler):
         Returns:
             Dict with client_secret, host, access_token, client_token or None
         """
-        file_path = Path(path).expanduser()
-        if not file_path.exists():
-            return None
-
+        file_path = expand_path(path)
         try:
-            config = self._read_edgerc(file_path)
-            if section not in config:
+            values = self._read_edgerc(file_path).get(section)
+            if values is None:
                 return None
 
             return {
-                "client_secret": config.get(section, "client_secret", fallback=None),
-                "host": config.get(section, "host", fallback=None),
-                "access_token": config.get(section, "access_token", fallback=None),
-                "client_token": config.get(section, "client_token", fallback=None),
+                "client_secret": values.get("client_secret"),
+                "host": values.get("host"),
+                "access_token": values.get("access_token"),
+                "client_token": values.get("client_token"),
             }
         except Exception:
             return None
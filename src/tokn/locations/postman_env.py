@@ -9,11 +9,24 @@ Requires:
 - Variable key name (from path)
 """
 
+import copy
 import os
-
-import httpx
+import threading
+import time
 
 from tokn.locations.base import LocationHandler
+from tokn.utils.http import http_client
+
+# A PUT replaces an environment's whole variable list, so writers of the same
+# environment (e.g. two services rotating in parallel) must not interleave
+# their read-modify-write; one lock per environment_id, shared process-wide.
+_env_write_locks: dict[str, threading.Lock] = {}
+_env_write_locks_guard = threading.Lock()
+
+
+def _env_write_lock(environment_id: str) -> threading.Lock:
+    with _env_write_locks_guard:
+        return _env_write_locks.setdefault(environment_id, threading.Lock())
 
 
 class PostmanEnvironmentHandler(LocationHandler):
@@ -30,9 +43,18 @@ class PostmanEnvironmentHandler(LocationHandler):
     """
 
     API_BASE = "https://api.getpostman.com"
+    # A rotation reads the same environment several times (current token,
+    # backup); serve those reads from a response this fresh. Writes always
+    # revalidate, since another writer may have changed the environment.
+    ENV_CACHE_TTL_SECONDS = 5
+
+    backup_is_token_value = True
 
     def __init__(self):
         super().__init__("postman-env")
+        # environment_id -> (fetched_at, etag, response body)
+        self._env_cache: dict[str, tuple[float, str | None, dict]] = {}
+        self._env_lock = threading.Lock()
 
     def read_token(self, path: str, **kwargs) -> str | None:
         """Read a variable value from a Postman environment.
@@ -86,26 +108,31 @@ class PostmanEnvironmentHandler(LocationHandler):
             return False
 
         try:
-            env_data = self._get_environment(api_key, environment_id)
-            if not env_data:
-                return False
+            with _env_write_lock(environment_id):
+                # Build on the server's current list, not a cached one that
+                # may predate another writer's PUT
+                env_data = self._get_environment(
+                    api_key, environment_id, revalidate=True
+                )
+                if not env_data:
+                    return False
 
-            environment = env_data.get("environment", {})
-            values = environment.get("values", [])
+                environment = env_data.get("environment", {})
+                values = environment.get("values", [])
 
-            variable_found = False
-            for var in values:
-                if var.get("key") == path:
-                    var["value"] = token
-                    variable_found = True
-                    break
+                variable_found = False
+                for var in values:
+                    if var.get("key") == path:
+                        var["value"] = token
+                        variable_found = True
+                        break
 
-            if not variable_found:
-                values.append({"key": path, "value": token, "enabled": True})
+                if not variable_found:
+                    values.append({"key": path, "value": token, "enabled": True})
 
-            return self._update_environment(
-                api_key, environment_id, environment.get("name", ""), values
-            )
+                return self._update_environment(
+                    api_key, environment_id, environment.get("name", ""), values
+                )
         except Exception:
             return False
 
@@ -113,20 +140,51 @@ class PostmanEnvironmentHandler(LocationHandler):
         """Return current variable value as backup."""
         return self.read_token(path, **kwargs)
 
-    def _get_environment(self, api_key: str, environment_id: str) -> dict | None:
-        """Get environment data from Postman API."""
+    def _get_environment(
+        self, api_key: str, environment_id: str, revalidate: bool = False
+    ) -> dict | None:
+        """Get environment data from Postman API.
+
+        Responses are cached for ENV_CACHE_TTL_SECONDS; after that, or always
+        when ``revalidate`` is set, the cached body is revalidated with
+        If-None-Match when the API sent an ETag. Callers get their own copy
+        to modify.
+        """
+        now = time.monotonic()
+        with self._env_lock:
+            cached = self._env_cache.get(environment_id)
+            if (
+                cached
+                and not revalidate
+                and now - cached[0] < self.ENV_CACHE_TTL_SECONDS
+            ):
+                return copy.deepcopy(cached[2])
+
+        headers = {"X-API-Key": api_key}
+        if cached and cached[1]:
+            headers["If-None-Match"] = cached[1]
+
         try:
-            with httpx.Client() as client:
-                response = client.get(
-                    f"{self.API_BASE}/environments/{environment_id}",
-                    headers={"X-API-Key": api_key},
-                )
-                if response.status_code != 200:
-                    return None
-                return response.json()
+            client = http_client()
+            response = client.get(
+                f"{self.API_BASE}/environments/{environment_id}",
+                headers=headers,
+            )
+            if response.status_code == 304 and cached:
+                etag, body = cached[1], cached[2]
+            elif response.status_code == 200:
+                etag, body = response.headers.get("ETag"), response.json()
+            else:
+                return None
         except Exception:
             return None
 
+        with self._env_lock:
+            # Don't replace an entry a concurrent PUT stored while we fetched
+            if self._env_cache.get(environment_id) is cached:
+                self._env_cache[environment_id] = (now, etag, body)
+            return copy.deepcopy(body)
+
     def _update_environment(
         self, api_key: str, environment_id: str, name: str, values: list[dict]
     ) -> bool:
@@ -135,15 +193,28 @@ class PostmanEnvironmentHandler(LocationHandler):
         Uses PUT to replace the environment with updated values.
         """
         try:
-            with httpx.Client() as client:
-                response = client.put(
-                    f"{self.API_BASE}/environments/{environment_id}",
-                    headers={
-                        "X-API-Key": api_key,
-                        "Content-Type": "application/json",
-                    },
-                    json={"environment": {"name": name, "values": values}},
-                )
-                return response.status_code == 200
+            client = http_client()
+            response = client.put(
+                f"{self.API_BASE}/environments/{environment_id}",
+                headers={"X-API-Key": api_key},
+                json={"environment": {"name": name, "values": values}},
+            )
+            ok = response.status_code == 200
         except Exception:
+            ok = False
+
+        if not ok:
+            # The server's state is unknown now; refetch on the next access
+            with self._env_lock:
+                self._env_cache.pop(environment_id, None)
             return False
+
+        # The PUT replaced the whole variable list: cache what was sent for
+        # later reads (writes revalidate it first; there is no ETag for it)
+        with self._env_lock:
+            cached = self._env_cache.get(environment_id)
+            if cached:
+                body = copy.deepcopy(cached[2])
+                body.setdefault("environment", {})["values"] = copy.deepcopy(values)
+                self._env_cache[environment_id] = (time.monotonic(), None, body)
+        return True
@@ -9,7 +9,9 @@ Rotates Akamai EdgeGrid credentials using the Identity Management API:
 Uses requests + edgegrid-python for EdgeGrid authentication.
 """
 
+import os
 from datetime import UTC, datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
 
 import requests
@@ -18,6 +20,17 @@ from akamai.edgegrid import EdgeGridAuth, EdgeRc
 from tokn.providers.base import RotationResult, TokenProvider
 
 
+@lru_cache(maxsize=16)
+def _load_edgerc(path: str, ino: int, mtime_ns: int, size: int) -> EdgeRc:
+    """Parse a .edgerc once per file version (path, inode, mtime, size).
+
+    An equal-size rewrite in the same mtime tick keeps that key, so a
+    successful rotate() clears the cache before its credentials are
+    written back.
+    """
+    return EdgeRc(path)
+
+
 class AkamaiEdgeGridProvider(TokenProvider):
     """Provider for Akamai API Client Credentials rotation.
 
@@ -30,12 +43,21 @@ class AkamaiEdgeGridProvider(TokenProvider):
     OVERLAP_DAYS = 7
     DEFAULT_EXPIRY_DAYS = 90
 
+    supports_auto_rotation = True
+
     def __init__(self):
         super().__init__("Akamai EdgeGrid Credentials")
+        self._session: requests.Session | None = None
+
+    def _get_session(self) -> requests.Session:
+        """Return the provider's session, created on first use.
 
-    @property
-    def supports_auto_rotation(self) -> bool:
-        return True
+        Keeping one session keeps its HTTPS connections alive between the
+        list/create/update calls and across rotations in the same run.
+        """
+        if self._session is None:
+            self._session = requests.Session()
+        return self._session
 
     def rotate(self, current_token: str, **kwargs) -> RotationResult:
         """Rotate Akamai API credentials.
@@ -56,10 +78,11 @@ class AkamaiEdgeGridProvider(TokenProvider):
 
         try:
             expanded_path = str(Path(edgerc_path).expanduser())
-            edgerc = EdgeRc(expanded_path)
+            st = os.stat(expanded_path)
+            edgerc = _load_edgerc(expanded_path, st.st_ino, st.st_mtime_ns, st.st_size)
             baseurl = f"https://{edgerc.get(section, 'host')}"
 
-            session = requests.Session()
+            session = self._get_session()
             session.auth = EdgeGridAuth.from_edgerc(edgerc, section)
 
             current_client_token = edgerc.get(section, "client_token")
@@ -98,6 +121,8 @@ class AkamaiEdgeGridProvider(TokenProvider):
                     raise
 
             expires_at = datetime.now(UTC) + timedelta(days=expiry_days)
+            # The caller rewrites .edgerc next, possibly within the same tick
+            _load_edgerc.cache_clear()
 
             return RotationResult(
                 success=True,
@@ -185,7 +210,8 @@ class AkamaiEdgeGridProvider(TokenProvider):
             ).replace(tzinfo=UTC)
             new_expiry = min(new_expiry, max_expiry_dt)
 
-        expiry_str = new_expiry.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+        # Both candidates are UTC-aware, so isoformat ends in +00:00
+        expiry_str = new_expiry.isoformat(timespec="seconds").replace("+00:00", ".000Z")
 
         payload = {
             "expiresOn": expiry_str,
@@ -2,6 +2,7 @@
 
 from abc import ABC, abstractmethod
 from datetime import datetime
+from typing import ClassVar
 
 
 class RotationResult:
@@ -20,14 +21,17 @@ class RotationResult:
 
 
 class TokenProvider(ABC):
+    # Constant per provider class; every concrete subclass must set it.
+    supports_auto_rotation: ClassVar[bool]
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if not isinstance(getattr(cls, "supports_auto_rotation", None), bool):
+            raise TypeError(f"{cls.__name__} must set supports_auto_rotation")
+
     def __init__(self, name: str):
         self.name = name
 
-    @property
-    @abstractmethod
-    def supports_auto_rotation(self) -> bool:
-        pass
-
     @abstractmethod
     def rotate(self, current_token: str, **kwargs) -> RotationResult:
         pass
@@ -10,22 +10,44 @@ Requires account_id in location metadata for rotation.
 """
 
 from datetime import UTC, datetime, timedelta
+from typing import Any
 
 import httpx
 
 from tokn.providers.base import RotationResult, TokenProvider
+from tokn.utils.http import RATE_LIMITED, http_client, send_with_retries
+
+
+def _parse_response(
+    response: httpx.Response, failure: str, default_error: str
+) -> tuple[Any, str | None]:
+    """Unwrap a Cloudflare API envelope into (result, None) or (None, error).
+
+    Non-200 errors are prefixed with ``failure``; ``default_error`` is used
+    when the API reports success=false without an error message.
+    """
+    if response.status_code != 200:
+        try:
+            err_msg = response.json().get("errors", [{}])[0].get("message", "")
+            return None, f"{failure}: {err_msg}"
+        except Exception:
+            return None, f"{failure}: HTTP {response.status_code}"
+
+    data = response.json()
+    if not data.get("success"):
+        errors = data.get("errors", [])
+        return None, errors[0].get("message") if errors else default_error
+    return data["result"], None
 
 
 class CloudflareProvider(TokenProvider):
     API_BASE = "https://api.cloudflare.com/client/v4"
 
+    supports_auto_rotation = True
+
     def __init__(self):
         super().__init__("Cloudflare API Token")
 
-    @property
-    def supports_auto_rotation(self) -> bool:
-        return True
-
     def rotate(self, current_token: str, **kwargs) -> RotationResult:
         account_id = kwargs.get("account_id")
         expiry_days = kwargs.get("expiry_days", 90)
@@ -37,40 +59,36 @@ class CloudflareProvider(TokenProvider):
             )
 
         try:
-            with httpx.Client() as client:
-                # Verify token to get its ID
-                token_id, error_msg = self._get_token_id(
-                    client, current_token, account_id
-                )
-                if not token_id:
-                    return RotationResult(
-                        success=False, error=error_msg or "Could not retrieve token ID"
-                    )
-
-                # Get token details for update
-                token_details, error_msg = self._get_token_details(
-                    client, current_token, account_id, token_id
-                )
-                if not token_details:
-                    return RotationResult(
-                        success=False,
-                        error=error_msg or "Could not retrieve token details",
-                    )
-
-                # Roll token to generate new value
-                new_token = self._roll_token(
-                    client, current_token, account_id, token_id
-                )
-
-                # Update token expiry (use new token for auth)
-                expires_at = self._update_token_expiry(
-                    client, new_token, account_id, token_id, token_details, expiry_days
+            client = http_client()
+            # Verify token to get its ID
+            token_id, error_msg = self._get_token_id(client, current_token, account_id)
+            if not token_id:
+                return RotationResult(
+                    success=False, error=error_msg or "Could not retrieve token ID"
                 )
 
+            # Get token details for update
+            token_details, error_msg = self._get_token_details(
+                client, current_token, account_id, token_id
+            )
+            if not token_details:
                 return RotationResult(
-                    success=True, new_token=new_token, expires_at=expires_at
+                    success=False,
+                    error=error_msg or "Could not retrieve token details",
                 )
 
+            # Roll token to generate new value
+            new_token = self._roll_token(client, current_token, account_id, token_id)
+
+            # Update token expiry (use new token for auth)
+            expires_at = self._update_token_expiry(
+                client, new_token, account_id, token_id, token_details, expiry_days
+            )
+
+            return RotationResult(
+                success=True, new_token=new_token, expires_at=expires_at
+            )
+
         except httpx.HTTPStatusError as e:
             error_detail = ""
             try:
@@ -96,26 +114,15 @@ class CloudflareProvider(TokenProvider):
         """
         try:
             verify_url = f"{self.API_BASE}/accounts/{account_id}/tokens/verify"
-            verify_resp = client.get(
-                verify_url, headers={"Authorization": f"Bearer {token}"}
+            verify_resp = send_with_retries(
+                client.get, verify_url, headers={"Authorization": f"Bearer {token}"}
             )
-            if verify_resp.status_code != 200:
-                try:
-                    err_data = verify_resp.json()
-                    err_msg = err_data.get("errors", [{}])[0].get("message", "")
-                    return None, f"Token verify failed: {err_msg}"
-                except Exception:
-                    return None, f"Token verify failed: HTTP {verify_resp.status_code}"
-
-            verify_data = verify_resp.json()
-            if not verify_data.get("success"):
-                errors = verify_data.get("errors", [])
-                error_msg = (
-                    errors[0].get("message") if errors else "Token verification failed"
-                )
-                return None, error_msg
-
-            return verify_data["result"]["id"], None
+            result, error = _parse_response(
+                verify_resp, "Token verify failed", "Token verification failed"
+            )
+            if result is None:
+                return None, error
+            return result["id"], None
         except httpx.HTTPStatusError as e:
             return None, f"HTTP {e.response.status_code}"
         except KeyError as e:
@@ -128,30 +135,14 @@ class CloudflareProvider(TokenProvider):
     ) -> tuple[dict | None, str | None]:
         """Get token details (name, policies) for update."""
         try:
-            response = client.get(
+            response = send_with_retries(
+                client.get,
                 f"{self.API_BASE}/accounts/{account_id}/tokens/{token_id}",
                 headers={"Authorization": f"Bearer {token}"},
             )
-            if response.status_code != 200:
-                try:
-                    err_data = response.json()
-                    err_msg = err_data.get("errors", [{}])[0].get("message", "")
-                    return None, f"Get token details failed: {err_msg}"
-                except Exception:
-                    status = response.status_code
-                    return None, f"Get token details failed: HTTP {status}"
-
-            data = response.json()
-            if not data.get("success"):
-                errors = data.get("errors", [])
-                error_msg = (
-                    errors[0].get("message")
-                    if errors
-                    else "Failed to get token details"
-                )
-                return None, error_msg
-
-            return data["result"], None
+            return _parse_response(
+                response, "Get token details failed", "Failed to get token details"
+            )
         except Exception as e:
             return None, str(e)
 
@@ -159,12 +150,12 @@ class CloudflareProvider(TokenProvider):
         self, client: httpx.Client, current_token: str, account_id: str, token_id: str
     ) -> str:
         """Roll token to generate new value."""
-        response = client.put(
+        # Rolling is not idempotent: only retry when the API refused the call
+        response = send_with_retries(
+            client.put,
             f"{self.API_BASE}/accounts/{account_id}/tokens/{token_id}/value",
-            headers={
-                "Authorization": f"Bearer {current_token}",
-                "Content-Type": "application/json",
-            },
+            retry_statuses=RATE_LIMITED,
+            headers={"Authorization": f"Bearer {current_token}"},
             json={},
         )
         response.raise_for_status()
@@ -181,26 +172,24 @@ class CloudflareProvider(TokenProvider):
     ) -> datetime:
         """Update token expiry date and return new expiry datetime."""
         new_expiry = datetime.now(UTC) + timedelta(days=expiry_days)
-        expiry_str = new_expiry.strftime("%Y-%m-%dT%H:%M:%SZ")
+        expiry_str = new_expiry.isoformat(timespec="seconds").replace("+00:00", "Z")
 
         # Build update payload from existing token details
-        policies = []
-        for policy in token_details.get("policies", []):
-            clean_policy = {
+        policies = [
+            {
                 "effect": policy.get("effect", "allow"),
                 "resources": policy.get("resources", {}),
                 "permission_groups": [
-                    {"id": pg["id"]} for pg in policy.get("permission_groups", [])
+                    {"id": pg["id"]} for pg in policy.get("permission_groups", ())
                 ],
             }
-            policies.append(clean_policy)
+            for policy in token_details.get("policies", ())
+        ]
 
-        response = client.put(
+        response = send_with_retries(
+            client.put,
             f"{self.API_BASE}/accounts/{account_id}/tokens/{token_id}",
-            headers={
-                "Authorization": f"Bearer {token}",
-                "Content-Type": "application/json",
-            },
+            headers={"Authorization": f"Bearer {token}"},
             json={
                 "name": token_details.get("name", "tokn-rotated"),
                 "policies": policies,
@@ -9,23 +9,20 @@ For true auto-rotation, consider:
 2. Setting up an OAuth App for token refresh
 """
 
-import httpx
-
 from tokn.providers.base import RotationResult, TokenProvider
+from tokn.utils.http import http_client
 
 
 class GitHubProvider(TokenProvider):
     API_BASE = "https://api.github.com"
 
+    # GitHub PATs cannot be auto-rotated without OAuth App
+    # Mark as False to trigger manual instructions
+    supports_auto_rotation = False
+
     def __init__(self):
         super().__init__("GitHub PAT")
 
-    @property
-    def supports_auto_rotation(self) -> bool:
-        # GitHub PATs cannot be auto-rotated without OAuth App
-        # Mark as False to trigger manual instructions
-        return False
-
     def rotate(self, current_token: str, **kwargs) -> RotationResult:
         # Validate current token is still working
         if not self._validate_token(current_token):
@@ -41,11 +38,11 @@ class GitHubProvider(TokenProvider):
     def _validate_token(self, token: str) -> bool:
         """Validate token by checking user endpoint."""
         try:
-            with httpx.Client() as client:
-                response = client.get(
-                    f"{self.API_BASE}/user", headers={"Authorization": f"token {token}"}
-                )
-                return response.status_code == 200
+            client = http_client()
+            response = client.get(
+                f"{self.API_BASE}/user", headers={"Authorization": f"token {token}"}
+            )
+            return response.status_code == 200
         except Exception:
             return False
 
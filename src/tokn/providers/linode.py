@@ -5,6 +5,7 @@ from datetime import datetime, timedelta
 import httpx
 
 from tokn.providers.base import RotationResult, TokenProvider
+from tokn.utils.http import RATE_LIMITED, http_client, send_with_retries
 
 
 class LinodeProvider(TokenProvider):
@@ -12,13 +13,11 @@ class LinodeProvider(TokenProvider):
 
     API_BASE = "https://api.linode.com/v4"
 
+    supports_auto_rotation = True
+
     def __init__(self):
         super().__init__("Linode PAT")
 
-    @property
-    def supports_auto_rotation(self) -> bool:
-        return True
-
     def rotate(self, current_token: str, **kwargs) -> RotationResult:
         date_str = datetime.now().strftime("%Y%m%d")
         default_label = f"tokn-linode-{date_str}"
@@ -27,25 +26,26 @@ class LinodeProvider(TokenProvider):
         expiry_days = kwargs.get("expiry_days", 90)
 
         try:
-            with httpx.Client() as client:
-                new_token, expires_at = self._create_token(
-                    client, current_token, label, scopes, expiry_days
-                )
+            client = http_client()
+            new_token, expires_at = self._create_token(
+                client, current_token, label, scopes, expiry_days
+            )
 
-                old_token_id = self._get_current_token_id(client, current_token)
-                if old_token_id:
-                    self._revoke_token(client, current_token, old_token_id)
+            old_token_id = self._get_current_token_id(client, current_token)
+            if old_token_id:
+                self._revoke_token(client, current_token, old_token_id)
 
-                return RotationResult(
-                    success=True, new_token=new_token, expires_at=expires_at
-                )
+            return RotationResult(
+                success=True, new_token=new_token, expires_at=expires_at
+            )
 
         except Exception as e:
             return RotationResult(success=False, error=str(e))
 
     def _get_current_token_id(self, client: httpx.Client, token: str) -> int | None:
         try:
-            response = client.get(
+            response = send_with_retries(
+                client.get,
                 f"{self.API_BASE}/profile/tokens",
                 headers={"Authorization": f"Bearer {token}"},
             )
@@ -68,21 +68,22 @@ class LinodeProvider(TokenProvider):
         expiry_days: int,
     ) -> tuple[str, datetime]:
         expiry_date = datetime.now() + timedelta(days=expiry_days)
-        expiry = expiry_date.strftime("%Y-%m-%dT%H:%M:%S")
+        expiry = expiry_date.isoformat(timespec="seconds")
 
-        response = client.post(
+        # Creating is not idempotent: only retry when the API refused the call
+        response = send_with_retries(
+            client.post,
             f"{self.API_BASE}/profile/tokens",
-            headers={
-                "Authorization": f"Bearer {current_token}",
-                "Content-Type": "application/json",
-            },
+            retry_statuses=RATE_LIMITED,
+            headers={"Authorization": f"Bearer {current_token}"},
             json={"label": label, "scopes": scopes, "expiry": expiry},
         )
         response.raise_for_status()
         return response.json()["token"], expiry_date
 
     def _revoke_token(self, client: httpx.Client, token: str, token_id: int) -> None:
-        client.delete(
+        send_with_retries(
+            client.delete,
             f"{self.API_BASE}/profile/tokens/{token_id}",
             headers={"Authorization": f"Bearer {token}"},
         )
@@ -14,13 +14,11 @@ class OtherProvider(TokenProvider):
     Users can leverage the --notes field to add custom rotation instructions.
     """
 
+    supports_auto_rotation = False
+
     def __init__(self):
         super().__init__("Other/Custom Service")
 
-    @property
-    def supports_auto_rotation(self) -> bool:
-        return False
-
     def rotate(self, current_token: str, **kwargs) -> RotationResult:
         return RotationResult(
             success=False,
@@ -4,9 +4,8 @@ NOTE: Postman API keys cannot be programmatically rotated via API.
 This provider validates the token and provides manual rotation instructions.
 """
 
-import httpx
-
 from tokn.providers.base import RotationResult, TokenProvider
+from tokn.utils.http import http_client
 
 
 class PostmanProvider(TokenProvider):
@@ -18,13 +17,11 @@ class PostmanProvider(TokenProvider):
 
     API_BASE = "https://api.getpostman.com"
 
+    supports_auto_rotation = False
+
     def __init__(self):
         super().__init__("Postman API Key")
 
-    @property
-    def supports_auto_rotation(self) -> bool:
-        return False
-
     def rotate(self, current_token: str, **kwargs) -> RotationResult:
         if not self._validate_token(current_token):
             return RotationResult(
@@ -39,11 +36,9 @@ class PostmanProvider(TokenProvider):
     def _validate_token(self, token: str) -> bool:
         """Validate token by checking /me endpoint."""
         try:
-            with httpx.Client() as client:
-                response = client.get(
-                    f"{self.API_BASE}/me", headers={"X-API-Key": token}
-                )
-                return response.status_code == 200
+            client = http_client()
+            response = client.get(f"{self.API_BASE}/me", headers={"X-API-Key": token})
+            return response.status_code == 200
         except Exception:
             return False
 
@@ -4,13 +4,11 @@ from tokn.providers.base import RotationResult, TokenProvider
 
 
 class TerraformAccountProvider(TokenProvider):
+    supports_auto_rotation = False
+
     def __init__(self):
         super().__init__("HCP Terraform Account Token")
 
-    @property
-    def supports_auto_rotation(self) -> bool:
-        return False
-
     def rotate(self, current_token: str, **kwargs) -> RotationResult:
         return RotationResult(
             success=False, error="Manual rotation required via 'terraform login'"
@@ -0,0 +1,37 @@
+"""Secure, atomic file writes for credential and metadata files."""
+
+import os
+import stat
+import threading
+from pathlib import Path
+
+SECURE_FILE_MODE = stat.S_IRUSR | stat.S_IWUSR  # 0600
+
+
+def atomic_write(path: Path, data: bytes) -> None:
+    """Replace path with data: write a 0600 temp file, fsync, then rename.
+
+    A crash mid-write leaves the previous file intact, and the file is never
+    visible with looser permissions. Symlinks (e.g. a dotfiles checkout) are
+    resolved first so the target file is replaced rather than the link.
+    """
+    target = Path(path).resolve()
+    # Unique per process and thread, so concurrent writers never share a temp
+    tmp_file = target.with_name(
+        f"{target.name}.tmp.{os.getpid()}.{threading.get_ident()}"
+    )
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_CLOEXEC", 0)
+    fd = os.open(tmp_file, flags, SECURE_FILE_MODE)
+    try:
+        # O_CREAT's mode is ignored if a stale temp file already exists
+        os.fchmod(fd, SECURE_FILE_MODE)
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view) :]
+        os.fsync(fd)
+    except BaseException:
+        os.close(fd)
+        tmp_file.unlink(missing_ok=True)
+        raise
+    os.close(fd)
+    os.replace(tmp_file, target)
@@ -0,0 +1,79 @@
+"""Shared HTTP client for provider and location API calls."""
+
+import atexit
+import random
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+import httpx
+
+_client: httpx.Client | None = None
+_lock = threading.Lock()
+
+
+def http_client() -> httpx.Client:
+    """Return the process-wide keep-alive client, creating it on first use.
+
+    Reusing one connection pool means only the first request to each API host
+    pays for the TCP and TLS handshake; later calls (including parallel ones
+    from ``rotate --all``) reuse the open connections. Callers must not close
+    or use it as a context manager; it is closed once at interpreter exit.
+    """
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                _client = httpx.Client(
+                    # Keep idle connections across a whole `rotate --all` run
+                    limits=httpx.Limits(
+                        max_keepalive_connections=16, keepalive_expiry=30.0
+                    ),
+                    timeout=httpx.Timeout(10.0, connect=5.0),
+                )
+                atexit.register(_client.close)
+    return _client
+
+
+# Statuses that mean "try again later". 502-504 may come back after the
+# server acted on the request, so they are only retried for idempotent calls.
+TRANSIENT_STATUSES = frozenset({429, 502, 503, 504})
+RATE_LIMITED = frozenset({429})
+
+MAX_ATTEMPTS = 4
+MAX_RETRY_DELAY = 8.0
+
+
+def _retry_delay(response: httpx.Response, attempt: int) -> float:
+    retry_after = response.headers.get("Retry-After", "")
+    if retry_after.isdigit():
+        return min(float(retry_after), MAX_RETRY_DELAY)
+    base = min(0.5 * 2 ** (attempt - 1), MAX_RETRY_DELAY)
+    return base / 2 + random.uniform(0, base / 2)
+
+
+def send_with_retries(
+    send: Callable[..., httpx.Response],
+    *args: Any,
+    retry_statuses: frozenset[int] = TRANSIENT_STATUSES,
+    **kwargs: Any,
+) -> httpx.Response:
+    """Call ``send(*args, **kwargs)``, retrying transient failures.
+
+    ``send`` is a client method such as ``client.get``. Responses with a
+    status in ``retry_statuses`` and connection failures (the request never
+    reached the server) are retried with jittered exponential backoff, or
+    the server's ``Retry-After``. The last attempt's result is returned or
+    raised as-is.
+    """
+    for attempt in range(1, MAX_ATTEMPTS):
+        try:
+            response = send(*args, **kwargs)
+        except (httpx.ConnectError, httpx.ConnectTimeout):
+            time.sleep(min(0.5 * 2 ** (attempt - 1), MAX_RETRY_DELAY))
+            continue
+        if response.status_code not in retry_statuses:
+            return response
+        time.sleep(_retry_delay(response, attempt))
+    return send(*args, **kwargs)
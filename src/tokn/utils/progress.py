@@ -3,13 +3,6 @@
 import sys
 from contextlib import contextmanager
 
-from rich.progress import (
-    Progress,
-    SpinnerColumn,
-    TextColumn,
-    TimeElapsedColumn,
-)
-
 
 @contextmanager
 def progress_spinner(message: str = "Loading", estimate: str | None = None):
@@ -26,6 +19,13 @@ def progress_spinner(message: str = "Loading", estimate: str | None = None):
         with progress_spinner("Rotating token", "~5s"):
             result = provider.rotate(token)
     """
+    from rich.progress import (
+        Progress,
+        SpinnerColumn,
+        TextColumn,
+        TimeElapsedColumn,
+    )
+
     full_message = f"{message} ({estimate})" if estimate else message
 
     progress = Progress(
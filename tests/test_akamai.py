@@ -3,6 +3,7 @@
 import os
 from unittest.mock import MagicMock, patch
 
+from tokn.locations import edgerc
 from tokn.locations.edgerc import EdgercHandler
 from tokn.providers.akamai import AkamaiEdgeGridProvider
 
@@ -146,6 +147,76 @@ client_token = akab-client-token
         assert creds["access_token"] == "akab-access-token"
         assert creds["client_token"] == "akab-client-token"
 
+    def test_read_token_ini_variants(self, tmp_path):
+        """Test comments, ':' delimiters and header comments are handled."""
+        edgerc_content = """# Akamai credentials
+[default];primary client
+; comment line
+client_secret: secret=with=equals
+host = akab-test.luna.akamaiapis.net
+"""
+        edgerc_path = tmp_path / ".edgerc"
+        edgerc_path.write_text(edgerc_content)
+
+        handler = EdgercHandler()
+        result = handler.read_token(str(edgerc_path), section="default")
+        assert result == "secret=with=equals"
+
+    def test_write_token_through_symlink(self, tmp_path):
+        """Test writing via a symlinked .edgerc updates the target file."""
+        target = tmp_path / "dotfiles" / "edgerc"
+        target.parent.mkdir()
+        target.write_text("[default]\nclient_secret = old\n")
+        link = tmp_path / ".edgerc"
+        link.symlink_to(target)
+
+        handler = EdgercHandler()
+        assert handler.write_token(str(link), "new", section="default") is True
+
+        assert link.is_symlink()
+        assert "client_secret = new" in target.read_text()
+        assert [p.name for p in (tmp_path / "dotfiles").iterdir()] == ["edgerc"]
+
+    def test_parse_cached_until_file_changes(self, tmp_path):
+        """Test repeated reads reuse one parse and a write invalidates it."""
+        edgerc_path = tmp_path / ".edgerc"
+        edgerc_path.write_text("[default]\nclient_secret = old\nhost = h\n")
+        edgerc._parse_cached.cache_clear()
+
+        handler = EdgercHandler()
+        with patch.object(edgerc, "_parse", wraps=edgerc._parse) as parse:
+            assert handler.read_token(str(edgerc_path)) == "old"
+            assert handler.get_section_credentials(str(edgerc_path))["host"] == "h"
+            assert parse.call_count == 1
+
+            handler.write_token(str(edgerc_path), "new-secret")
+            assert handler.read_token(str(edgerc_path)) == "new-secret"
+
+    def test_write_tokens_bulk_rewrites_file_once(self, tmp_path):
+        """Test several sections of one file are updated in a single write."""
+        edgerc_path = tmp_path / ".edgerc"
+        edgerc_path.write_text(
+            "[default]\nclient_secret = a\nhost = h1\n\n"
+            "[ccu]\nclient_secret = b\nhost = h2\n"
+        )
+
+        handler = EdgercHandler()
+        items = [
+            (str(edgerc_path), "new-a", {"section": "default"}),
+            (str(edgerc_path), "new-b", {"section": "ccu", "client_token": "ct"}),
+        ]
+        with patch.object(
+            handler, "_write_edgerc", wraps=handler._write_edgerc
+        ) as write:
+            assert handler.write_tokens_bulk(items) == [True, True]
+            assert write.call_count == 1
+
+        assert handler.read_token(str(edgerc_path), section="default") == "new-a"
+        creds = handler.get_section_credentials(str(edgerc_path), section="ccu")
+        assert creds["client_secret"] == "new-b"
+        assert creds["client_token"] == "ct"
+        assert creds["host"] == "h2"
+
 
 class TestAkamaiEdgeGridProvider:
     """Tests for AkamaiEdgeGridProvider."""
@@ -192,7 +263,6 @@ client_token = akab-old-client-token
                 "status": "ACTIVE",
             }
         ]
-        list_response.raise_for_status = MagicMock()
 
         create_response = MagicMock()
         create_response.json.return_value = {
@@ -201,10 +271,8 @@ client_token = akab-old-client-token
             "credentialId": 67890,
             "status": "ACTIVE",
         }
-        create_response.raise_for_status = MagicMock()
 
         update_response = MagicMock()
-        update_response.raise_for_status = MagicMock()
 
         mock_session_instance.get.return_value = list_response
         mock_session_instance.post.return_value = create_response
@@ -263,7 +331,6 @@ client_token = akab-old-client-token
         list_response.json.return_value = [
             {"clientToken": "akab-different-token", "credentialId": 12345}
         ]
-        list_response.raise_for_status = MagicMock()
         mock_session_instance.get.return_value = list_response
 
         provider = AkamaiEdgeGridProvider()
@@ -276,3 +343,53 @@ client_token = akab-old-client-token
         assert result.success is False
         assert result.error is not None
         assert "Could not find credential" in result.error
+
+    @patch("tokn.providers.akamai.requests.Session")
+    @patch("tokn.providers.akamai.EdgeGridAuth")
+    @patch("tokn.providers.akamai.EdgeRc")
+    def test_session_and_edgerc_reused(
+        self, mock_edgerc, mock_auth, mock_session, tmp_path
+    ):
+        """Test repeated rotations reuse the session and parse per file version."""
+        edgerc_path = tmp_path / ".edgerc"
+        edgerc_path.write_text("[default]\nclient_secret = x\nhost = y\n")
+        mock_edgerc.return_value.get.return_value = "value"
+        mock_session.return_value.get.return_value.json.return_value = []
+
+        provider = AkamaiEdgeGridProvider()
+        provider.rotate("x", edgerc_path=str(edgerc_path))
+        provider.rotate("x", edgerc_path=str(edgerc_path))
+        assert mock_session.call_count == 1
+        assert mock_edgerc.call_count == 1
+
+        edgerc_path.write_text("[default]\nclient_secret = new\nhost = y\n")
+        provider.rotate("new", edgerc_path=str(edgerc_path))
+        assert mock_edgerc.call_count == 2
+
+    @patch("tokn.providers.akamai.requests.Session")
+    @patch("tokn.providers.akamai.EdgeGridAuth")
+    @patch("tokn.providers.akamai.EdgeRc")
+    def test_edgerc_reparsed_after_successful_rotation(
+        self, mock_edgerc, mock_auth, mock_session, tmp_path
+    ):
+        """Test a same-size, same-mtime rewrite after rotation is not missed."""
+        edgerc_path = tmp_path / ".edgerc"
+        edgerc_path.write_text("[default]\nclient_secret = old1\nhost = y\n")
+        mtime_ns = edgerc_path.stat().st_mtime_ns
+        mock_edgerc.return_value.get.return_value = "ct"
+        session = mock_session.return_value
+        session.get.return_value.json.return_value = [
+            {"clientToken": "ct", "credentialId": 1}
+        ]
+        session.post.return_value.json.return_value = {
+            "clientSecret": "new1",
+            "clientToken": "ct2",
+        }
+
+        provider = AkamaiEdgeGridProvider()
+        assert provider.rotate("old1", edgerc_path=str(edgerc_path)).success
+
+        edgerc_path.write_text("[default]\nclient_secret = new1\nhost = y\n")
+        os.utime(edgerc_path, ns=(mtime_ns, mtime_ns))
+        provider.rotate("new1", edgerc_path=str(edgerc_path))
+        assert mock_edgerc.call_count == 2
@@ -6,9 +6,12 @@ from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
+import tomli_w
 from click.testing import CliRunner
 
 from tokn.cli import cli
+from tokn.core.backend import factory
+from tokn.core.backend.doppler import DopplerBackend
 from tokn.core.backend.factory import (
     get_backend,
     get_config,
@@ -62,6 +65,20 @@ class TestLocalBackend:
             assert token is not None
             assert token.service == "github"
 
+    def test_save_registry_replaces_file_atomically(self):
+        """Test saving tightens permissions and leaves no temp file behind."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            backend = LocalBackend(data_dir=tmpdir)
+            registry_file = Path(tmpdir) / "registry.json"
+            registry_file.write_text("{}")
+            os.chmod(registry_file, 0o644)
+
+            backend.save_registry(TokenRegistry())
+
+            assert oct(os.stat(registry_file).st_mode)[-3:] == "600"
+            assert sorted(p.name for p in Path(tmpdir).iterdir()) == ["registry.json"]
+            assert backend.load_registry().tokens == {}
+
     def test_sync_returns_registry(self):
         """Test sync method returns loaded registry."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -81,6 +98,245 @@ class TestLocalBackend:
             assert len(synced.tokens) == 1
             assert synced.get_token("sync-test") is not None
 
+    def test_defer_saves_writes_once(self):
+        """Test defer_saves buffers queued saves into a single write."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            backend = LocalBackend(data_dir=tmpdir)
+
+            with patch.object(
+                backend, "save_registry", wraps=backend.save_registry
+            ) as mock_save:
+                with backend.defer_saves():
+                    for name in ("one", "two", "three"):
+                        registry = backend.load_for_update()
+                        registry.add_token(
+                            TokenMetadata(
+                                name=name,
+                                service="linode",
+                                rotation_type=RotationType.AUTO,
+                                locations=[],
+                            )
+                        )
+                        backend.queue_save(registry)
+                    mock_save.assert_not_called()
+
+                mock_save.assert_called_once()
+
+            assert len(backend.load_registry().tokens) == 3
+
+    def test_defer_saves_keeps_original_error(self):
+        """Test a failed flush is noted on the block's error, not raised over it."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            backend = LocalBackend(data_dir=tmpdir)
+
+            with patch.object(
+                backend, "save_registry", side_effect=ValueError("too large")
+            ):
+                with pytest.raises(RuntimeError) as exc_info:
+                    with backend.defer_saves():
+                        backend.queue_save(backend.load_for_update())
+                        raise RuntimeError("rotation failed")
+
+            assert exc_info.value.__notes__ == [
+                "Deferred registry save also failed: too large"
+            ]
+            assert backend._deferred is None
+
+    def test_defer_saves_flushes_at_cap(self):
+        """Test defer_saves flushes early once max_pending is reached."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            backend = LocalBackend(data_dir=tmpdir)
+
+            with patch.object(backend, "save_registry") as mock_save:
+                with backend.defer_saves(max_pending=2):
+                    for _ in range(3):
+                        backend.queue_save(backend.load_for_update())
+                    assert mock_save.call_count == 1
+
+                assert mock_save.call_count == 2
+
+
+class TestDopplerBackend:
+    def test_init_does_not_require_doppler_cli(self):
+        """Test constructing the backend never touches the doppler CLI."""
+        with patch("tokn.core.backend.doppler.subprocess.run") as mock_run:
+            DopplerBackend()
+            mock_run.assert_not_called()
+
+    def test_missing_doppler_cli_raises_on_use(self):
+        """Test a missing doppler CLI is reported when a command runs."""
+        backend = DopplerBackend()
+        with patch(
+            "tokn.core.backend.doppler.subprocess.run",
+            side_effect=FileNotFoundError("doppler"),
+        ):
+            with pytest.raises(RuntimeError, match="Doppler CLI not found"):
+                backend.get_secret("SECRET")
+
+    def test_get_secrets_bulk_downloads_once(self):
+        """Test bulk secrets are fetched once and kept current by set_secret."""
+        backend = DopplerBackend()
+        download = MagicMock(stdout='{"A": "1", "B": "2"}')
+
+        with patch(
+            "tokn.core.backend.doppler.subprocess.run", return_value=download
+        ) as mock_run:
+            assert backend.get_secrets_bulk("p", "c")["A"] == "1"
+            assert backend.get_secrets_bulk("p", "c")["B"] == "2"
+            assert mock_run.call_count == 1
+            assert mock_run.call_args.args[0][:3] == ["doppler", "secrets", "download"]
+
+            backend.set_secret("A", "new", "p", "c")
+            assert backend.get_secrets_bulk("p", "c")["A"] == "new"
+            assert mock_run.call_count == 2
+
+    def test_load_registry_is_cached(self):
+        """Test repeat loads reuse one doppler call until sync."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache_file = Path(tmpdir) / "doppler.json"
+            with patch.object(DopplerBackend, "CACHE_FILE", cache_file):
+                backend = DopplerBackend()
+
+                with patch.object(backend, "_run_doppler", return_value="") as mock_run:
+                    first = backend.load_registry()
+                    first.add_token(
+                        TokenMetadata(
+                            name="unsaved",
+                            service="linode",
+                            rotation_type=RotationType.AUTO,
+                            locations=[],
+                        )
+                    )
+                    second = backend.load_registry()
+                    assert mock_run.call_count == 1
+                    assert second.get_token("unsaved") is None
+
+                    backend.sync()
+                    assert mock_run.call_count == 2
+
+    def test_save_registry_refreshes_cache(self):
+        """Test a saved registry is served without another doppler call."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache_file = Path(tmpdir) / "doppler.json"
+            with patch.object(DopplerBackend, "CACHE_FILE", cache_file):
+                backend = DopplerBackend()
+
+                registry = TokenRegistry()
+                registry.add_token(
+                    TokenMetadata(
+                        name="saved",
+                        service="linode",
+                        rotation_type=RotationType.AUTO,
+                        locations=[],
+                    )
+                )
+                with patch("tokn.core.backend.doppler.subprocess.run"):
+                    backend.save_registry(registry)
+
+                with patch.object(backend, "_run_doppler") as mock_run:
+                    assert backend.load_registry().get_token("saved") is not None
+                    mock_run.assert_not_called()
+
+    def test_load_registry_invalid_json_returns_empty(self):
+        """Test an unparseable metadata secret loads as an empty registry."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache_file = Path(tmpdir) / "doppler.json"
+            with patch.object(DopplerBackend, "CACHE_FILE", cache_file):
+                backend = DopplerBackend()
+
+                with patch.object(backend, "_run_doppler", return_value="{not json"):
+                    assert backend.load_registry().tokens == {}
+
+    def test_disk_cache_shared_across_instances(self):
+        """Test a fresh on-disk cache skips doppler for a new instance."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache_file = Path(tmpdir) / "doppler.json"
+            blob = TokenRegistry().model_dump_json()
+            with patch.object(DopplerBackend, "CACHE_FILE", cache_file):
+                first = DopplerBackend()
+                second = DopplerBackend()
+                other_config = DopplerBackend(config="prd")
+
+                with patch.object(first, "_run_doppler", return_value=blob):
+                    first.load_registry()
+                assert oct(os.stat(cache_file).st_mode)[-3:] == "600"
+
+                with patch.object(second, "_run_doppler") as mock_run:
+                    second.load_registry()
+                    mock_run.assert_not_called()
+
+                with patch.object(
+                    other_config, "_run_doppler", return_value=blob
+                ) as mock_run:
+                    other_config.load_registry()
+                    mock_run.assert_called_once()
+
+                # sync always refreshes from Doppler, even with a fresh cache
+                with patch.object(
+                    second, "_run_doppler", return_value=blob
+                ) as mock_run:
+                    second.sync()
+                    mock_run.assert_called_once()
+
+    def test_corrupt_disk_cache_is_ignored(self):
+        """Test a cache entry with a non-numeric cached_at falls back to Doppler."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache_file = Path(tmpdir) / "doppler.json"
+            cache_file.write_text(
+                '{"key": ["tokn", "dev"], "cached_at": "soon", "blob": "{}"}'
+            )
+            with patch.object(DopplerBackend, "CACHE_FILE", cache_file):
+                backend = DopplerBackend()
+
+                with patch.object(backend, "_run_doppler", return_value="") as mock_run:
+                    assert backend.load_registry().tokens == {}
+                    mock_run.assert_called_once()
+
+    def test_load_for_update_bypasses_disk_cache(self):
+        """Test read-modify-writes build on Doppler's copy, not the cache."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache_file = Path(tmpdir) / "doppler.json"
+            stale = TokenRegistry().model_dump_json()
+            latest = TokenRegistry()
+            latest.add_token(
+                TokenMetadata(
+                    name="other-device",
+                    service="linode",
+                    rotation_type=RotationType.AUTO,
+                    locations=[],
+                )
+            )
+            with patch.object(DopplerBackend, "CACHE_FILE", cache_file):
+                with patch.object(DopplerBackend, "_run_doppler", return_value=stale):
+                    DopplerBackend().load_registry()
+
+                backend = DopplerBackend()
+                with patch.object(
+                    backend, "_run_doppler", return_value=latest.model_dump_json()
+                ) as mock_run:
+                    assert backend.load_registry().get_token("other-device") is None
+                    mock_run.assert_not_called()
+
+                    registry = backend.load_for_update()
+                    assert registry.get_token("other-device") is not None
+                    mock_run.assert_called_once()
+
+    def test_disk_cache_created_owner_only(self):
+        """Test the cache file is 0600 regardless of the process umask."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache_file = Path(tmpdir) / "doppler.json"
+            with patch.object(DopplerBackend, "CACHE_FILE", cache_file):
+                backend = DopplerBackend()
+                old_umask = os.umask(0)
+                try:
+                    # No chmod after the fact: the mode must come from creation
+                    with patch("os.chmod"), patch("os.fchmod"):
+                        backend._write_cache("{}")
+                finally:
+                    os.umask(old_umask)
+
+                assert oct(os.stat(cache_file).st_mode)[-3:] == "600"
+
 
 class TestBackendFactory:
     def test_get_backend_local_default(self):
@@ -121,6 +377,42 @@ class TestBackendFactory:
                     assert loaded["backend"] == "doppler"
                     assert loaded["doppler"]["project"] == "test"
 
+    def test_config_is_cached_and_copied(self):
+        """Test config is parsed once per mtime and callers get copies."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config_file = Path(tmpdir) / "config.toml"
+            config_dir = Path(tmpdir)
+
+            with patch("tokn.core.backend.factory.CONFIG_FILE", config_file):
+                with patch("tokn.core.backend.factory.CONFIG_DIR", config_dir):
+                    save_config({"backend": "local"})
+
+                    tomllib = factory._toml_reader()
+                    with patch.object(tomllib, "load", wraps=tomllib.load) as mock_load:
+                        first = get_config()
+                        first["doppler"]["project"] = "mutated"
+                        second = get_config()
+                        assert mock_load.call_count == 1
+                        assert second["doppler"]["project"] == "tokn"
+
+                    save_config({"backend": "doppler"})
+                    assert get_config()["backend"] == "doppler"
+
+            assert factory.DEFAULT_CONFIG["doppler"]["project"] == "tokn"
+
+    def test_render_config_matches_toml(self):
+        """Test the config writer emits TOML that round-trips."""
+        config = {
+            "backend": "doppler",
+            "local": {"data_dir": 'C:\\Users\\me "tokn"'},
+            "doppler": {"project": "tokn", "config": "dev"},
+            "extra": {"nested": {"retries": 3}},
+        }
+        for cfg in (factory.DEFAULT_CONFIG, config):
+            rendered = factory._render_config(cfg)
+            assert factory._toml_reader().loads(rendered.decode()) == cfg
+            assert rendered.decode() == tomli_w.dumps(cfg)
+
 
 class TestBackendMigration:
     def test_migrate_local_to_local_fails(self):
@@ -1,5 +1,6 @@
 """Integration tests for CLI commands."""
 
+import json
 from datetime import datetime, timedelta
 from unittest.mock import MagicMock, patch
 
@@ -16,7 +17,7 @@ class TestTrackCommand:
 
         with patch("tokn.cli.get_backend") as mock_backend:
             mock_instance = MagicMock()
-            mock_instance.load_registry.return_value = TokenRegistry()
+            mock_instance.load_for_update.return_value = TokenRegistry()
             mock_backend.return_value = mock_instance
 
             result = runner.invoke(
@@ -43,7 +44,7 @@ class TestTrackCommand:
 
         with patch("tokn.cli.get_backend") as mock_backend:
             mock_instance = MagicMock()
-            mock_instance.load_registry.return_value = TokenRegistry()
+            mock_instance.load_for_update.return_value = TokenRegistry()
             mock_backend.return_value = mock_instance
 
             result = runner.invoke(
@@ -62,7 +63,7 @@ class TestTrackCommand:
 
             assert result.exit_code == 0
 
-            saved_registry = mock_instance.save_registry.call_args[0][0]
+            saved_registry = mock_instance.save_registry.call_args.args[0]
             token = saved_registry.get_token("test-token")
             assert token is not None
             assert len(token.locations) == 1
@@ -73,6 +74,33 @@ class TestTrackCommand:
                 "config": "prod",
             }
 
+    def test_track_service_is_case_insensitive(self):
+        """Test --service accepts any casing and stores the canonical name."""
+        runner = CliRunner()
+
+        with patch("tokn.cli.get_backend") as mock_backend:
+            mock_instance = MagicMock()
+            mock_instance.load_for_update.return_value = TokenRegistry()
+            mock_backend.return_value = mock_instance
+
+            result = runner.invoke(
+                cli,
+                [
+                    "track",
+                    "test-token",
+                    "--service",
+                    "GitHub",
+                    "--location",
+                    "doppler:TEST_TOKEN",
+                ],
+            )
+
+            assert result.exit_code == 0
+            saved_registry = mock_instance.save_registry.call_args.args[0]
+            token = saved_registry.get_token("test-token")
+            assert token is not None
+            assert token.service == "github"
+
     def test_track_duplicate_token(self):
         """Test tracking duplicate token fails."""
         runner = CliRunner()
@@ -88,7 +116,7 @@ class TestTrackCommand:
 
         with patch("tokn.cli.get_backend") as mock_backend:
             mock_instance = MagicMock()
-            mock_instance.load_registry.return_value = registry
+            mock_instance.load_for_update.return_value = registry
             mock_backend.return_value = mock_instance
 
             result = runner.invoke(
@@ -114,7 +142,7 @@ class TestTrackCommand:
 
         with patch("tokn.cli.get_backend") as mock_backend:
             mock_instance = MagicMock()
-            mock_instance.load_registry.return_value = TokenRegistry()
+            mock_instance.load_for_update.return_value = TokenRegistry()
             mock_backend.return_value = mock_instance
 
             result = runner.invoke(
@@ -133,6 +161,7 @@ class TestTrackCommand:
 
             assert result.exit_code == 1
             assert "Invalid location format" in result.output
+            mock_instance.load_registry.assert_not_called()
 
     def test_track_no_locations(self):
         """Test tracking without locations fails."""
@@ -140,7 +169,7 @@ class TestTrackCommand:
 
         with patch("tokn.cli.get_backend") as mock_backend:
             mock_instance = MagicMock()
-            mock_instance.load_registry.return_value = TokenRegistry()
+            mock_instance.load_for_update.return_value = TokenRegistry()
             mock_backend.return_value = mock_instance
 
             result = runner.invoke(
@@ -157,6 +186,7 @@ class TestTrackCommand:
 
             assert result.exit_code == 1
             assert "At least one location is required" in result.output
+            mock_instance.load_registry.assert_not_called()
 
 
 class TestListCommand:
@@ -199,6 +229,91 @@ class TestListCommand:
             assert "test-token" in result.output
             assert "github" in result.output
 
+    def test_list_expiring_none(self):
+        """Test --expiring reports when every token is active."""
+        runner = CliRunner()
+
+        token = TokenMetadata(
+            name="test-token",
+            service="github",
+            rotation_type=RotationType.MANUAL,
+            locations=[TokenLocation(type="doppler", path="TEST")],
+            expires_at=datetime.now() + timedelta(days=30),
+        )
+        registry = TokenRegistry()
+        registry.add_token(token)
+
+        with patch("tokn.cli.get_backend") as mock_backend:
+            mock_instance = MagicMock()
+            mock_instance.load_registry.return_value = registry
+            mock_backend.return_value = mock_instance
+
+            result = runner.invoke(cli, ["list", "--expiring"])
+
+            assert result.exit_code == 0
+            assert "No expiring or expired tokens" in result.output
+            assert "Token Status" not in result.output
+
+    def test_list_json(self):
+        """Test list --format json emits machine-readable tokens."""
+        runner = CliRunner()
+
+        token = TokenMetadata(
+            name="test-token",
+            service="github",
+            rotation_type=RotationType.MANUAL,
+            locations=[TokenLocation(type="doppler", path="TEST")],
+            expires_at=datetime.now() + timedelta(days=30),
+        )
+        registry = TokenRegistry()
+        registry.add_token(token)
+
+        with patch("tokn.cli.get_backend") as mock_backend:
+            mock_instance = MagicMock()
+            mock_instance.load_registry.return_value = registry
+            mock_backend.return_value = mock_instance
+
+            result = runner.invoke(cli, ["list", "--format", "json"])
+
+            assert result.exit_code == 0
+            data = json.loads(result.output)
+            assert len(data) == 1
+            assert data[0]["name"] == "test-token"
+            assert data[0]["status"] == "active"
+            assert data[0]["days_until_expiry"] == 29
+
+    def test_list_simple_layout(self):
+        """Test list --format simple keeps the tabulate column layout."""
+        runner = CliRunner()
+
+        token = TokenMetadata(
+            name="test-token",
+            service="github",
+            rotation_type=RotationType.MANUAL,
+            locations=[TokenLocation(type="doppler", path="TEST")],
+        )
+        registry = TokenRegistry()
+        registry.add_token(token)
+
+        with patch("tokn.cli.get_backend") as mock_backend:
+            mock_instance = MagicMock()
+            mock_instance.load_registry.return_value = registry
+            mock_backend.return_value = mock_instance
+
+            result = runner.invoke(cli, ["list", "--format", "simple"])
+
+            assert result.exit_code == 0
+            lines = result.output.splitlines()
+            assert lines[0] == (
+                "Name        Service    Type    Status    Expires    Last Rotated"
+            )
+            assert lines[1] == (
+                "----------  ---------  ------  --------  ---------  --------------"
+            )
+            assert lines[2] == (
+                "test-token  github     manual  ✓ active  N/A        Never"
+            )
+
 
 class TestRemoveCommand:
     def test_remove_existing_token(self):
@@ -216,7 +331,7 @@ class TestRemoveCommand:
 
         with patch("tokn.cli.get_backend") as mock_backend:
             mock_instance = MagicMock()
-            mock_instance.load_registry.return_value = registry
+            mock_instance.load_for_update.return_value = registry
             mock_backend.return_value = mock_instance
 
             result = runner.invoke(cli, ["remove", "to-remove"])
@@ -231,7 +346,7 @@ class TestRemoveCommand:
 
         with patch("tokn.cli.get_backend") as mock_backend:
             mock_instance = MagicMock()
-            mock_instance.load_registry.return_value = TokenRegistry()
+            mock_instance.load_for_update.return_value = TokenRegistry()
             mock_backend.return_value = mock_instance
 
             result = runner.invoke(cli, ["remove", "nonexistent"])
@@ -240,6 +355,58 @@ class TestRemoveCommand:
             assert "not found" in result.output
 
 
+class TestUpdateCommand:
+    def test_update_notes(self):
+        """Test updating notes saves the registry."""
+        runner = CliRunner()
+
+        token = TokenMetadata(
+            name="to-update",
+            service="github",
+            rotation_type=RotationType.MANUAL,
+            locations=[],
+            notes="old",
+        )
+        registry = TokenRegistry()
+        registry.add_token(token)
+
+        with patch("tokn.cli.get_backend") as mock_backend:
+            mock_instance = MagicMock()
+            mock_instance.load_for_update.return_value = registry
+            mock_backend.return_value = mock_instance
+
+            result = runner.invoke(cli, ["update", "to-update", "--notes", "new"])
+
+            assert result.exit_code == 0
+            assert "Token updated" in result.output
+            mock_instance.save_registry.assert_called_once()
+
+    def test_update_identical_notes_skips_save(self):
+        """Test a no-op update does not write the registry."""
+        runner = CliRunner()
+
+        token = TokenMetadata(
+            name="to-update",
+            service="github",
+            rotation_type=RotationType.MANUAL,
+            locations=[],
+            notes="same",
+        )
+        registry = TokenRegistry()
+        registry.add_token(token)
+
+        with patch("tokn.cli.get_backend") as mock_backend:
+            mock_instance = MagicMock()
+            mock_instance.load_for_update.return_value = registry
+            mock_backend.return_value = mock_instance
+
+            result = runner.invoke(cli, ["update", "to-update", "--notes", "same"])
+
+            assert result.exit_code == 0
+            assert "already up to date" in result.output
+            mock_instance.save_registry.assert_not_called()
+
+
 class TestDescribeCommand:
     def test_describe_existing_token(self):
         """Test showing details for existing token."""
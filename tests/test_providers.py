@@ -1,8 +1,16 @@
 """Tests for provider plugins."""
 
-from tokn.providers.base import RotationResult
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from tokn.providers.base import RotationResult, TokenProvider
+from tokn.providers.cloudflare import CloudflareProvider
 from tokn.providers.github import GitHubProvider
+from tokn.providers.linode import LinodeProvider
 from tokn.providers.terraform import TerraformAccountProvider
+from tokn.utils.http import RATE_LIMITED, http_client, send_with_retries
 
 
 class TestGitHubProvider:
@@ -44,6 +52,68 @@ class TestTerraformAccountProvider:
         assert "credentials.tfrc.json" in instructions
 
 
+class TestCloudflareProvider:
+    def test_api_errors_are_reported(self):
+        """Verify verify/details failures surface Cloudflare's error message."""
+        provider = CloudflareProvider()
+        client = MagicMock()
+
+        client.get.return_value = httpx.Response(
+            403, json={"success": False, "errors": [{"message": "bad token"}]}
+        )
+        assert provider._get_token_id(client, "t", "acct") == (
+            None,
+            "Token verify failed: bad token",
+        )
+
+        client.get.return_value = httpx.Response(500, content=b"oops")
+        assert provider._get_token_details(client, "t", "acct", "id") == (
+            None,
+            "Get token details failed: HTTP 500",
+        )
+
+        client.get.return_value = httpx.Response(
+            200, json={"success": True, "result": {"id": "tok-1"}}
+        )
+        assert provider._get_token_id(client, "t", "acct") == ("tok-1", None)
+
+    def test_update_expiry_sends_utc_z_timestamp(self):
+        """Verify expires_on is a second-precision UTC timestamp ending in Z."""
+        provider = CloudflareProvider()
+        client = MagicMock()
+        client.put.return_value = httpx.Response(
+            200, request=httpx.Request("PUT", "https://x")
+        )
+
+        expires_at = provider._update_token_expiry(
+            client, "t", "acct", "id", {"name": "n"}, 90
+        )
+
+        expires_on = client.put.call_args.kwargs["json"]["expires_on"]
+        assert expires_on == expires_at.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class TestLinodeProvider:
+    def test_token_id_lookup_matches_prefix(self):
+        """Verify one unfiltered list call finds the token by its prefix."""
+        provider = LinodeProvider()
+        client = MagicMock()
+        client.get.return_value = httpx.Response(
+            200,
+            json={
+                "data": [
+                    {"id": 1, "token": "zzzzzzzzzzzzzzzz"},
+                    {"id": 2, "token": "abcdefghijklmnop"},
+                ]
+            },
+            request=httpx.Request("GET", "https://x"),
+        )
+
+        assert provider._get_current_token_id(client, "abcdefghijklmnop-rest") == 2
+        client.get.assert_called_once()
+        assert "X-Filter" not in client.get.call_args.kwargs["headers"]
+
+
 class TestRotationResult:
     def test_success_result(self):
         """Verify successful rotation result."""
@@ -66,3 +136,57 @@ class TestRotationResult:
         result = RotationResult(success=True, new_token="token")
 
         assert result.rotated_at is not None
+
+
+class TestTokenProvider:
+    def test_subclass_must_declare_auto_rotation(self):
+        """Verify providers without supports_auto_rotation are rejected."""
+        with pytest.raises(TypeError, match="supports_auto_rotation"):
+
+            class MissingFlag(TokenProvider):
+                def rotate(self, current_token: str, **kwargs) -> RotationResult:
+                    return RotationResult(success=False)
+
+
+class TestHttpClient:
+    def test_client_is_shared(self):
+        """Verify providers reuse one keep-alive client across calls."""
+        assert http_client() is http_client()
+        assert not http_client().is_closed
+
+    @patch("tokn.utils.http.time.sleep")
+    def test_transient_responses_are_retried(self, mock_sleep):
+        """Verify 429/5xx are retried, honouring Retry-After."""
+        send = MagicMock(
+            side_effect=[
+                httpx.Response(429, headers={"Retry-After": "2"}),
+                httpx.Response(503),
+                httpx.Response(200),
+            ]
+        )
+
+        response = send_with_retries(send, "https://x", headers={"a": "b"})
+
+        assert response.status_code == 200
+        assert send.call_count == 3
+        send.assert_called_with("https://x", headers={"a": "b"})
+        assert mock_sleep.call_args_list[0].args == (2.0,)
+
+    @patch("tokn.utils.http.time.sleep")
+    def test_retries_are_bounded(self, mock_sleep):
+        """Verify the last transient response is returned after max attempts."""
+        send = MagicMock(return_value=httpx.Response(502))
+
+        assert send_with_retries(send, "https://x").status_code == 502
+        assert send.call_count == 4
+
+    @patch("tokn.utils.http.time.sleep")
+    def test_non_idempotent_calls_only_retry_rate_limits(self, mock_sleep):
+        """Verify a 502 on a create/roll call is not replayed."""
+        send = MagicMock(return_value=httpx.Response(502))
+
+        response = send_with_retries(send, "https://x", retry_statuses=RATE_LIMITED)
+
+        assert response.status_code == 502
+        send.assert_called_once()
+        mock_sleep.assert_not_called()
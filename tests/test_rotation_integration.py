@@ -1,10 +1,16 @@
 """Integration tests for rotation orchestrator with service-specific logic."""
 
+import copy
+import threading
+import time
 from datetime import datetime, timedelta
-from unittest.mock import MagicMock, patch
+from unittest.mock import DEFAULT, MagicMock, patch
 
+from tokn.core.backend.doppler import DopplerBackend
+from tokn.core.backend.local import LocalBackend
 from tokn.core.rotation import RotationOrchestrator
 from tokn.core.token import RotationType, TokenLocation, TokenMetadata
+from tokn.locations.postman_env import PostmanEnvironmentHandler
 from tokn.providers.base import RotationResult
 
 
@@ -54,27 +60,27 @@ class TestAkamaiRotationIntegration:
         orchestrator.location_handlers["edgerc"] = mock_handler
 
         # Mock backend
-        with patch.object(orchestrator.backend, "load_registry") as mock_load:
-            with patch.object(orchestrator.backend, "save_registry"):
-                mock_registry = MagicMock()
-                mock_load.return_value = mock_registry
+        with patch.multiple(
+            orchestrator.backend, load_registry=DEFAULT, save_registry=DEFAULT
+        ) as mocks:
+            mocks["load_registry"].return_value = MagicMock()
 
-                # Execute rotation
-                success, message, locations = orchestrator.rotate_token(token_metadata)
+            # Execute rotation
+            success, message, locations = orchestrator.rotate_token(token_metadata)
 
-                # Verify rotation succeeded
-                assert success is True
-                assert "edgerc:~/.edgerc" in locations
+            # Verify rotation succeeded
+            assert success is True
+            assert "edgerc:~/.edgerc" in locations
 
-                # CRITICAL: Verify client_token was passed to location handler
-                mock_handler.write_token.assert_called_once()
-                call_args = mock_handler.write_token.call_args
+            # CRITICAL: Verify client_token was passed to location handler
+            mock_handler.write_token.assert_called_once()
+            call_args = mock_handler.write_token.call_args
 
-                # Check that client_token was in the metadata
-                assert call_args[0][0] == "~/.edgerc"  # path
-                assert call_args[0][1] == "new-client-secret"  # token
-                assert "client_token" in call_args[1]  # kwargs
-                assert call_args[1]["client_token"] == "new-client-token"
+            # Check that client_token was in the metadata
+            assert call_args.args[0] == "~/.edgerc"  # path
+            assert call_args.args[1] == "new-client-secret"  # token
+            assert "client_token" in call_args.kwargs
+            assert call_args.kwargs["client_token"] == "new-client-token"
 
     def test_non_akamai_service_does_not_trigger_client_token_update(self):
         """Verify non-Akamai services don't trigger client_token logic."""
@@ -113,18 +119,433 @@ class TestAkamaiRotationIntegration:
         orchestrator.location_handlers["linode-cli"] = mock_handler
 
         # Mock backend
-        with patch.object(orchestrator.backend, "load_registry") as mock_load:
-            with patch.object(orchestrator.backend, "save_registry"):
-                mock_registry = MagicMock()
-                mock_load.return_value = mock_registry
+        with patch.multiple(
+            orchestrator.backend, load_registry=DEFAULT, save_registry=DEFAULT
+        ) as mocks:
+            mocks["load_registry"].return_value = MagicMock()
 
-                # Execute rotation
-                success, message, locations = orchestrator.rotate_token(token_metadata)
+            # Execute rotation
+            success, message, locations = orchestrator.rotate_token(token_metadata)
 
-                # Verify rotation succeeded
-                assert success is True
+            # Verify rotation succeeded
+            assert success is True
 
-                # Verify client_token was NOT passed (no client_token in kwargs)
-                mock_handler.write_token.assert_called_once()
-                call_args = mock_handler.write_token.call_args
-                assert "client_token" not in call_args[1]  # kwargs should not have it
+            # Verify client_token was NOT passed (no client_token in kwargs)
+            mock_handler.write_token.assert_called_once()
+            call_args = mock_handler.write_token.call_args
+            assert "client_token" not in call_args.kwargs
+
+
+class TestRotateAll:
+    """Tests for batch rotation across services."""
+
+    def test_providers_and_handlers_are_built_on_demand(self):
+        """Only the providers/handlers a rotation touches get constructed."""
+        orchestrator = RotationOrchestrator(backend=MagicMock())
+        assert dict(orchestrator.providers) == {}
+        assert dict(orchestrator.location_handlers) == {}
+
+        assert orchestrator.providers.get("linode") is orchestrator.providers["linode"]
+        assert orchestrator.providers.get("unknown") is None
+        assert list(orchestrator.providers) == ["linode"]
+
+    def test_doppler_backend_shared_with_location_handler(self):
+        """A Doppler metadata backend is reused by the doppler location."""
+        backend = DopplerBackend(project="tokn", config="dev")
+        orchestrator = RotationOrchestrator(backend=backend)
+        assert orchestrator.location_handlers["doppler"].backend is backend
+
+        other = RotationOrchestrator(backend=MagicMock())
+        assert other.location_handlers["doppler"].backend is not backend
+
+    def test_rotate_all_buckets_results_in_registry_order(self):
+        """Parallel rotation keeps service order and skips manual tokens."""
+        backend = MagicMock()
+        orchestrator = RotationOrchestrator(backend=backend)
+
+        tokens = [
+            TokenMetadata(
+                name="lin-1",
+                service="linode",
+                rotation_type=RotationType.AUTO,
+                locations=[],
+            ),
+            TokenMetadata(
+                name="gh",
+                service="github",
+                rotation_type=RotationType.MANUAL,
+                locations=[],
+            ),
+            TokenMetadata(
+                name="cf",
+                service="cloudflare-account-token",
+                rotation_type=RotationType.AUTO,
+                locations=[],
+            ),
+            TokenMetadata(
+                name="lin-2",
+                service="linode",
+                rotation_type=RotationType.AUTO,
+                locations=[],
+            ),
+        ]
+        backend.load_registry.return_value.list_tokens.return_value = tokens
+
+        def fake_rotate(token):
+            if token.name == "cf":
+                return False, "Rotation failed: boom", []
+            return True, "Rotated", []
+
+        with patch.object(orchestrator, "rotate_token", side_effect=fake_rotate):
+            results = orchestrator.rotate_all(max_workers=2)
+
+        assert [r["name"] for r in results["success"]] == ["lin-1", "lin-2"]
+        assert [r["name"] for r in results["failed"]] == ["cf"]
+        assert [r["name"] for r in results["manual"]] == ["gh"]
+
+    def test_failed_final_save_is_reported(self, tmp_path):
+        """A failed registry flush lists the unsaved tokens instead of raising."""
+        backend = LocalBackend(data_dir=str(tmp_path))
+        registry = backend.load_registry()
+        for name in ("lin-1", "lin-2"):
+            registry.add_token(
+                TokenMetadata(
+                    name=name,
+                    service="linode",
+                    rotation_type=RotationType.AUTO,
+                    locations=[TokenLocation(type="linode-cli", path=f"~/{name}")],
+                )
+            )
+        backend.save_registry(registry)
+
+        orchestrator = RotationOrchestrator(backend=backend)
+        provider = MagicMock()
+        provider.supports_auto_rotation = True
+        provider.rotate.return_value = RotationResult(success=True, new_token="new")
+        orchestrator.providers["linode"] = provider
+        handler = MagicMock()
+        handler.read_token.return_value = "old"
+        handler.backup_token.return_value = "old"
+        handler.write_tokens_bulk.return_value = [True]
+        orchestrator.location_handlers["linode-cli"] = handler
+
+        with patch.object(
+            backend, "save_registry", side_effect=ValueError("registry too large")
+        ):
+            results = orchestrator.rotate_all()
+
+        assert results["success"] == []
+        assert [r["name"] for r in results["failed"]] == ["lin-1", "lin-2"]
+        assert results["failed"][0]["error"] == (
+            "Rotated and written to linode-cli:~/lin-1, "
+            "but metadata was not saved: registry too large"
+        )
+
+    def test_services_sharing_postman_environment_keep_both_secrets(self, monkeypatch):
+        """Parallel services writing one Postman environment must not lose writes."""
+        monkeypatch.setenv("POSTMAN_API_KEY", "pmak")
+        server = {
+            "environment": {
+                "name": "shared",
+                "values": [
+                    {"key": "LINODE_TOKEN", "value": "old-linode"},
+                    {"key": "CF_TOKEN", "value": "old-cf"},
+                ],
+            }
+        }
+        both_fetched = threading.Barrier(2, timeout=0.2)
+
+        def get(url, headers=None):
+            response = MagicMock(status_code=200, headers={})
+            response.json.return_value = copy.deepcopy(server)
+            try:
+                # Line both workers' read-modify-write GETs up, if they can
+                both_fetched.wait()
+            except threading.BrokenBarrierError:
+                pass
+            return response
+
+        def put(url, headers=None, json=None):
+            time.sleep(0.01)
+            server["environment"] = copy.deepcopy(json["environment"])
+            return MagicMock(status_code=200)
+
+        handler = PostmanEnvironmentHandler()
+        handler.ENV_CACHE_TTL_SECONDS = 0
+        orchestrator = RotationOrchestrator(backend=MagicMock())
+        orchestrator.location_handlers["postman-env"] = handler
+
+        tokens = []
+        for service, var in (
+            ("linode", "LINODE_TOKEN"),
+            ("cloudflare-account-token", "CF_TOKEN"),
+        ):
+            provider = MagicMock(supports_auto_rotation=True)
+            provider.rotate.return_value = RotationResult(
+                success=True, new_token=f"new-{var}"
+            )
+            orchestrator.providers[service] = provider
+            tokens.append(
+                TokenMetadata(
+                    name=service,
+                    service=service,
+                    rotation_type=RotationType.AUTO,
+                    locations=[
+                        TokenLocation(
+                            type="postman-env",
+                            path=var,
+                            metadata={"environment_id": "env-shared"},
+                        )
+                    ],
+                )
+            )
+        orchestrator.backend.load_registry.return_value.list_tokens.return_value = (
+            tokens
+        )
+
+        with patch("tokn.locations.postman_env.http_client") as http_client:
+            http_client.return_value.get.side_effect = get
+            http_client.return_value.put.side_effect = put
+            results = orchestrator.rotate_all(max_workers=2)
+
+        assert len(results["success"]) == 2
+        values = {v["key"]: v["value"] for v in server["environment"]["values"]}
+        assert values == {
+            "LINODE_TOKEN": "new-LINODE_TOKEN",
+            "CF_TOKEN": "new-CF_TOKEN",
+        }
+
+
+class TestMissingDopplerCli:
+    def test_missing_doppler_cli_aborts_before_rotation(self):
+        """A doppler location without the CLI must fail before the provider rotates."""
+        orchestrator = RotationOrchestrator(backend=MagicMock())
+
+        token_metadata = TokenMetadata(
+            name="test-linode",
+            service="linode",
+            rotation_type=RotationType.AUTO,
+            locations=[
+                TokenLocation(type="linode-cli", path="~/.config/linode-cli"),
+                TokenLocation(
+                    type="doppler",
+                    path="LINODE_TOKEN",
+                    metadata={"project": "p", "config": "c"},
+                ),
+            ],
+        )
+
+        mock_provider = MagicMock()
+        mock_provider.supports_auto_rotation = True
+        orchestrator.providers["linode"] = mock_provider
+
+        mock_handler = MagicMock()
+        mock_handler.read_token.return_value = "old-token"
+        orchestrator.location_handlers["linode-cli"] = mock_handler
+
+        with patch(
+            "tokn.core.backend.doppler.subprocess.run",
+            side_effect=FileNotFoundError("doppler"),
+        ):
+            success, message, _ = orchestrator.rotate_token(token_metadata)
+
+        assert success is False
+        assert "Doppler CLI not found" in message
+        mock_provider.rotate.assert_not_called()
+
+
+class TestDopplerSourceBackup:
+    def test_doppler_source_is_read_once(self):
+        """The value read as the current token doubles as the Doppler backup."""
+        orchestrator = RotationOrchestrator(backend=MagicMock())
+
+        token_metadata = TokenMetadata(
+            name="test-linode",
+            service="linode",
+            rotation_type=RotationType.AUTO,
+            locations=[
+                TokenLocation(
+                    type="doppler",
+                    path="LINODE_TOKEN",
+                    metadata={"project": "p", "config": "c"},
+                ),
+            ],
+        )
+
+        mock_provider = MagicMock()
+        mock_provider.supports_auto_rotation = True
+        mock_provider.rotate.return_value = RotationResult(
+            success=True,
+            new_token="new-token",
+            expires_at=datetime.now() + timedelta(days=90),
+        )
+        orchestrator.providers["linode"] = mock_provider
+
+        doppler = orchestrator.location_handlers["doppler"].backend
+        with patch.object(
+            doppler, "get_secrets_bulk", return_value={"LINODE_TOKEN": "old-token"}
+        ) as mock_get:
+            with patch.object(doppler, "set_secret") as mock_set:
+                success, _, _ = orchestrator.rotate_token(token_metadata)
+
+        assert success is True
+        mock_get.assert_called_once()
+        mock_provider.rotate.assert_called_once()
+        mock_set.assert_called_once_with("LINODE_TOKEN", "new-token", "p", "c")
+
+    def test_rollback_restores_with_location_metadata(self):
+        """A failed write rolls back earlier locations with their own metadata."""
+        orchestrator = RotationOrchestrator(backend=MagicMock())
+
+        token_metadata = TokenMetadata(
+            name="test-linode",
+            service="linode",
+            rotation_type=RotationType.AUTO,
+            locations=[
+                TokenLocation(
+                    type="doppler",
+                    path="C:LINODE",
+                    metadata={"project": "p", "config": "c"},
+                ),
+                TokenLocation(type="linode-cli", path="~/.config/linode-cli"),
+            ],
+        )
+
+        mock_provider = MagicMock()
+        mock_provider.supports_auto_rotation = True
+        mock_provider.rotate.return_value = RotationResult(
+            success=True,
+            new_token="new-token",
+            expires_at=datetime.now() + timedelta(days=90),
+        )
+        orchestrator.providers["linode"] = mock_provider
+
+        doppler_handler = MagicMock()
+        doppler_handler.backup_is_token_value = True
+        doppler_handler.read_token.return_value = "old-token"
+        doppler_handler.write_token.return_value = True
+        linode_handler = MagicMock()
+        linode_handler.backup_token.return_value = None
+        linode_handler.write_token.return_value = False
+        orchestrator.location_handlers["doppler"] = doppler_handler
+        orchestrator.location_handlers["linode-cli"] = linode_handler
+
+        success, message, _ = orchestrator.rotate_token(token_metadata)
+
+        assert success is False
+        assert "Failed to update location" in message
+        doppler_handler.rollback_token.assert_called_once_with(
+            "C:LINODE", "old-token", project="p", config="c"
+        )
+
+
+class TestBatchedLocationWrites:
+    def test_same_type_locations_use_bulk_write(self):
+        """Locations sharing a handler are written with one bulk call."""
+        orchestrator = RotationOrchestrator(backend=MagicMock())
+        token_metadata = TokenMetadata(
+            name="test-linode",
+            service="linode",
+            rotation_type=RotationType.AUTO,
+            locations=[
+                TokenLocation(type="linode-cli", path="~/a"),
+                TokenLocation(type="linode-cli", path="~/b"),
+            ],
+        )
+
+        mock_provider = MagicMock()
+        mock_provider.supports_auto_rotation = True
+        mock_provider.rotate.return_value = RotationResult(
+            success=True, new_token="new-token"
+        )
+        orchestrator.providers["linode"] = mock_provider
+
+        handler = MagicMock()
+        handler.read_token.return_value = "old-token"
+        handler.backup_token.return_value = "backup"
+        handler.write_tokens_bulk.return_value = [True, False]
+        orchestrator.location_handlers["linode-cli"] = handler
+
+        success, message, _ = orchestrator.rotate_token(token_metadata)
+
+        handler.write_tokens_bulk.assert_called_once_with(
+            [("~/a", "new-token", {}), ("~/b", "new-token", {})]
+        )
+        handler.write_token.assert_not_called()
+        assert success is False
+        assert message == "Failed to update location: linode-cli:~/b"
+        assert handler.rollback_token.call_count == 2
+
+    def test_failed_group_stops_later_writes(self):
+        """A failed location group rolls back before later groups are written."""
+        orchestrator = RotationOrchestrator(backend=MagicMock())
+        token_metadata = TokenMetadata(
+            name="test-akamai",
+            service="akamai",
+            rotation_type=RotationType.AUTO,
+            locations=[
+                TokenLocation(type="edgerc", path="~/.edgerc"),
+                TokenLocation(type="doppler", path="SECRET"),
+            ],
+        )
+
+        mock_provider = MagicMock()
+        mock_provider.supports_auto_rotation = True
+        mock_provider.rotate.return_value = RotationResult(
+            success=True, new_token="new-token"
+        )
+        mock_provider.get_new_client_token.return_value = None
+        orchestrator.providers["akamai"] = mock_provider
+
+        edgerc = MagicMock()
+        edgerc.read_token.return_value = "old-token"
+        edgerc.backup_token.return_value = "backup"
+        edgerc.write_token.return_value = False
+        doppler = MagicMock()
+        doppler.backup_token.return_value = "old-token"
+        orchestrator.location_handlers["edgerc"] = edgerc
+        orchestrator.location_handlers["doppler"] = doppler
+
+        success, message, _ = orchestrator.rotate_token(token_metadata)
+
+        assert success is False
+        assert message == "Failed to update location: edgerc:~/.edgerc"
+        doppler.write_token.assert_not_called()
+        edgerc.rollback_token.assert_called_once()
+
+
+class TestRotationKwargs:
+    def test_kwargs_built_per_service(self):
+        """Each service gets its rotate() kwargs from its location metadata."""
+        orchestrator = RotationOrchestrator(backend=MagicMock())
+        cloudflare = TokenMetadata(
+            name="cf",
+            service="cloudflare-account-token",
+            rotation_type=RotationType.AUTO,
+            locations=[
+                TokenLocation(type="doppler", path="A"),
+                TokenLocation(type="doppler", path="B", metadata={"account_id": "x"}),
+            ],
+        )
+        akamai = TokenMetadata(
+            name="ak",
+            service="akamai",
+            rotation_type=RotationType.AUTO,
+            locations=[TokenLocation(type="edgerc", path="~/.edgerc")],
+        )
+        terraform = TokenMetadata(
+            name="tf",
+            service="terraform",
+            rotation_type=RotationType.AUTO,
+            locations=[],
+        )
+
+        assert orchestrator._get_rotation_kwargs(cloudflare) == {
+            "name": "tokn-cf",
+            "account_id": "x",
+        }
+        assert orchestrator._get_rotation_kwargs(akamai) == {
+            "edgerc_path": "~/.edgerc",
+            "section": "default",
+        }
+        assert orchestrator._get_rotation_kwargs(terraform) == {}
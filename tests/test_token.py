@@ -1,6 +1,6 @@
 """Tests for token metadata models."""
 
-from datetime import datetime, timedelta
+from datetime import UTC, datetime, timedelta
 
 from tokn.core.token import (
     RotationType,
@@ -43,6 +43,35 @@ def test_token_status_expired():
     assert token.status == TokenStatus.EXPIRED
 
 
+def test_token_status_timezone_aware():
+    token = TokenMetadata(
+        name="test",
+        service="github",
+        rotation_type=RotationType.AUTO,
+        locations=[],
+        expires_at=datetime.now(UTC) + timedelta(days=5, hours=1),
+    )
+    assert token.days_until_expiry == 5
+    assert token.status == TokenStatus.EXPIRING_SOON
+
+
+def test_days_until_expiry_at_matches_property():
+    now = datetime.now(UTC)
+    for expires_at in (
+        datetime.now() + timedelta(days=10, hours=1),
+        datetime.now(UTC) + timedelta(days=10, hours=1),
+    ):
+        token = TokenMetadata(
+            name="test",
+            service="github",
+            rotation_type=RotationType.AUTO,
+            locations=[],
+            expires_at=expires_at,
+        )
+        assert token.days_until_expiry_at(now) == token.days_until_expiry == 10
+        assert token.status_at(now) == token.status == TokenStatus.ACTIVE
+
+
 def test_token_registry_operations():
     registry = TokenRegistry()
 